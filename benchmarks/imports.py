@@ -0,0 +1,93 @@
+"""Import time and model access benchmarks.
+
+Measures the time to import the package and make the first model access in a fresh
+interpreter, and the time and memory of repeated model accesses on one API.
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --repeat 20 --json imports.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+from pyfortimanager import api
+
+
+# Code run in a fresh interpreter, timed from before the import to the end of each step.
+STARTUP = {
+    "import pyfortimanager": "import pyfortimanager",
+    "api()": "import pyfortimanager; pyfortimanager.api(host='https://fortimanager.example.com', token='token')",
+    "api().fortigates": "import pyfortimanager; pyfortimanager.api(host='https://fortimanager.example.com', token='token').fortigates",
+    "api().fortigates + session": "import pyfortimanager; f = pyfortimanager.api(host='https://fortimanager.example.com', token='token'); f.fortigates; f.session",
+    "async_api": "import pyfortimanager; pyfortimanager.async_api",
+}
+
+
+def startup(code: str, repeat: int):
+    """Returns the median milliseconds to run the code in a fresh interpreter, excluding the interpreter start.
+    """
+
+    script = f"import time; start = time.perf_counter(); {code}; print(time.perf_counter() - start)"
+    values = []
+
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+        values.append(float(output) * 1000)
+
+    return statistics.median(values)
+
+
+def access(number: int):
+    """Returns the nanoseconds per model access and per bound method lookup, and the bytes allocated by number accesses.
+    """
+
+    fortimanager = api(host="https://fortimanager.example.com", token="token")
+    fortimanager.fortigates
+
+    per_access = min(timeit.repeat(lambda: fortimanager.fortigates, number=number, repeat=5)) / number * 1e9
+    per_method = min(timeit.repeat(lambda: fortimanager.fortigates.all, number=number, repeat=5)) / number * 1e9
+
+    tracemalloc.start()
+    models = [fortimanager.fortigates for _ in range(number)]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return per_access, per_method, max(0, allocated - sys.getsizeof(models))
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmarks the import time and model accesses of pyfortimanager.")
+    parser.add_argument("--repeat", type=int, default=10, help="Fresh interpreters per startup step.")
+    parser.add_argument("--number", type=int, default=10000, help="Model accesses per access measurement.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    results = {"startup_ms": {}}
+    print(f"{'startup':<32}{'ms':>10}")
+
+    for name, code in STARTUP.items():
+        results['startup_ms'][name] = startup(code, args.repeat)
+        print(f"{name:<32}{results['startup_ms'][name]:>10.2f}")
+
+    per_access, per_method, allocated = access(args.number)
+    results.update(access_ns=per_access, method_ns=per_method, allocated_bytes=allocated, accesses=args.number)
+
+    print()
+    print(f"{'fortimanager.fortigates':<32}{per_access:>10.1f} ns")
+    print(f"{'fortimanager.fortigates.all':<32}{per_method:>10.1f} ns")
+    print(f"{'allocated by ' + str(args.number) + ' accesses':<32}{allocated:>10d} bytes")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmarks for the transport and models against the FortiManager simulator.
+
+Runs the real model classes against the simulator in a separate process, and reports the
+throughput, request latency percentiles and peak client memory of each scenario per fleet size.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 100 1000 --latency 0.005 --json bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+import tracemalloc
+
+from pyfortimanager import api
+
+from pyfortimanager.core.simulator import Simulator
+
+
+def serve(devices: int, latency: float, queue):
+    with Simulator(devices=devices, latency=latency, policies=0, task_duration=0.02) as simulator:
+        queue.put(simulator.url)
+
+        while True:
+            time.sleep(3600)
+
+
+def percentile(values: list, percent: float):
+    """Returns the nearest-rank percentile of the values.
+    """
+
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, int(round(percent / 100 * len(values) + 0.5)) - 1))
+
+    return values[index]
+
+
+class Latencies(object):
+    """Hook that collects the wall time of every request.
+    """
+
+    def __init__(self):
+        self.values = []
+
+    def after(self, request):
+        self.values.append(request.elapsed)
+
+
+def fortigates_all(fortimanager, names):
+    return len(fortimanager.fortigates.all()['data'])
+
+
+def fortigates_iter_all(fortimanager, names):
+    return sum(1 for fortigate in fortimanager.fortigates.iter_all(fields=["name", "sn", "os_ver"], meta=False))
+
+
+def fortigates_stream(fortimanager, names):
+    return sum(1 for fortigate in fortimanager.fortigates.all(stream=True))
+
+
+def scope_members(fortimanager, names):
+    fortimanager.device_groups.add_member(name="benchmark", fortigate=names)
+    fortimanager.device_groups.remove_member(name="benchmark", fortigate=names)
+    return len(names) * 2
+
+
+def proxy_sweep(fortimanager, names):
+    return len(fortimanager.fortigates_proxy.status(fortigate=names))
+
+
+def task_polling(fortimanager, names):
+    install = fortimanager.install_wizard.policy_package(policy_package="default", fortigate=names)
+
+    with fortimanager.task_waiter(interval=0.01, max_interval=0.05) as waiter:
+        finished = waiter.wait(install['tasks'])
+
+    return len(finished)
+
+
+SCENARIOS = {
+    "fortigates.all": fortigates_all,
+    "fortigates.iter_all": fortigates_iter_all,
+    "fortigates.all(stream)": fortigates_stream,
+    "scope members": scope_members,
+    "proxy sweep": proxy_sweep,
+    "task polling": task_polling,
+}
+
+
+def measure(url: str, devices: int, scenario, repeat: int):
+    names = [f"FGT-{index:05d}" for index in range(devices)]
+    latencies = Latencies()
+
+    with api(host=url, token="benchmark", hooks=[latencies]) as fortimanager:
+        # Warm up the connection pool
+        fortimanager.system.status()
+        latencies.values.clear()
+
+        items = 0
+        start = time.perf_counter()
+
+        for _ in range(repeat):
+            items += scenario(fortimanager, names)
+
+        elapsed = time.perf_counter() - start
+        values = list(latencies.values)
+        requests = len(values)
+
+        # Peak memory in a separate run, since tracing slows the client down
+        tracemalloc.start()
+        scenario(fortimanager, names)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "devices": devices,
+        "requests": requests,
+        "seconds": elapsed,
+        "requests_per_second": requests / elapsed if elapsed else None,
+        "items_per_second": items / elapsed if elapsed else None,
+        "p50_ms": percentile(values, 50) * 1000 if requests else None,
+        "p99_ms": percentile(values, 99) * 1000 if requests else None,
+        "peak_memory_mib": peak / 1048576
+    }
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmarks pyfortimanager against the FortiManager simulator.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Fleet sizes to benchmark.")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds the server waits before each response.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of each scenario per fleet size.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these scenarios.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'scenario':<24}{'devices':>8}{'requests':>10}{'req/s':>10}{'items/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak MiB':>10}")
+
+    for devices in args.sizes:
+        queue = multiprocessing.Queue()
+        server = multiprocessing.Process(target=serve, args=(devices, args.latency, queue), daemon=True)
+        server.start()
+
+        try:
+            url = queue.get(timeout=60)
+
+            for name in args.scenario or SCENARIOS:
+                result = dict(measure(url=url, devices=devices, scenario=SCENARIOS[name], repeat=args.repeat), scenario=name)
+                results.append(result)
+
+                print(f"{name:<24}{devices:>8}{result['requests']:>10}{result['requests_per_second']:>10.1f}{result['items_per_second']:>12.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['peak_memory_mib']:>10.2f}")
+        finally:
+            server.terminate()
+            server.join()
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,55 @@
-from pyfortimanager.core.api import Api as api
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public names and the modules they come from. Modules are imported on first access (PEP 562),
+# so importing the package does not import requests, aiohttp or the models.
+_EXPORTS = {
+    "api": ("pyfortimanager.core.api", "Api"),
+    "async_api": ("pyfortimanager.core.async_api", "AsyncApi"),
+    "FortiManagerError": ("pyfortimanager.core.exceptions", "FortiManagerError"),
+    "ResponseCache": ("pyfortimanager.core.cache", "ResponseCache"),
+    "RateLimiter": ("pyfortimanager.core.limiter", "RateLimiter"),
+    "CircuitBreaker": ("pyfortimanager.core.retry", "CircuitBreaker"),
+    "RetryPolicy": ("pyfortimanager.core.retry", "RetryPolicy"),
+    "Metrics": ("pyfortimanager.core.metrics", "Metrics"),
+    "RequestInfo": ("pyfortimanager.core.metrics", "RequestInfo"),
+    "url_template": ("pyfortimanager.core.metrics", "url_template"),
+    "Inventory": ("pyfortimanager.core.inventory", "Inventory"),
+    "Device": ("pyfortimanager.core.records", "Device"),
+    "ManagedAP": ("pyfortimanager.core.records", "ManagedAP"),
+    "ManagedSwitch": ("pyfortimanager.core.records", "ManagedSwitch"),
+    "task_id": ("pyfortimanager.core.tasks", "task_id"),
+    "Recorder": ("pyfortimanager.core.transport", "Recorder"),
+    "Replayer": ("pyfortimanager.core.transport", "Replayer"),
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from pyfortimanager.core.api import Api as api
+    from pyfortimanager.core.async_api import AsyncApi as async_api
+    from pyfortimanager.core.exceptions import FortiManagerError
+    from pyfortimanager.core.cache import ResponseCache
+    from pyfortimanager.core.limiter import RateLimiter
+    from pyfortimanager.core.retry import CircuitBreaker, RetryPolicy
+    from pyfortimanager.core.metrics import Metrics, RequestInfo, url_template
+    from pyfortimanager.core.inventory import Inventory
+    from pyfortimanager.core.records import Device, ManagedAP, ManagedSwitch
+    from pyfortimanager.core.tasks import task_id
+    from pyfortimanager.core.transport import Recorder, Replayer
+
+
+def __getattr__(name: str):
+    try:
+        module, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(import_module(module), attribute)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -1,124 +1,286 @@
-from pyfortimanager.models.adoms import ADOMs
-from pyfortimanager.models.cli_template_groups import CLI_Template_Groups
-from pyfortimanager.models.device_groups import Device_Groups
-from pyfortimanager.models.fortiaps_proxy import FortiAPs_Proxy
-from pyfortimanager.models.fortiaps import FortiAPs
-from pyfortimanager.models.fortigates_proxy import FortiGates_Proxy
-from pyfortimanager.models.fortigates import FortiGates
-from pyfortimanager.models.fortiswitches_proxy import FortiSwitches_Proxy
-from pyfortimanager.models.fortiswitches import FortiSwitches
-from pyfortimanager.models.install_wizard import Install_Wizard
-from pyfortimanager.models.metadata_variables import MetadataVariables
-from pyfortimanager.models.policy_packages import Policy_Packages
-from pyfortimanager.models.radius_servers import RADIUS_Servers
-from pyfortimanager.models.scripts import Scripts
-from pyfortimanager.models.sdwan_templates import SDWAN_Templates
-from pyfortimanager.models.system import System
+import importlib
+import threading
+from functools import cached_property
+
+from pyfortimanager.core import fleet
+from pyfortimanager.core.batch import Batch
+from pyfortimanager.core.cache import ResponseCache
+from pyfortimanager.core.deadline import deadline
+from pyfortimanager.core.limiter import RateLimiter
+from pyfortimanager.core.retry import CircuitBreaker, RetryPolicy
+from pyfortimanager.core.tasks import TaskWaiter
 
 
 class Api(object):
     """Base API class.
+
+    Models are imported and instantiated on first access, and the instance is kept for later
+    accesses, so fortimanager.fortigates returns the same object every time.
     """
 
-    def __init__(self, host: str, token: str, adom: str = "root", verify: bool = True, proxy_timeout: int = 60, **kwargs):
+    def __init__(self, host: str, token: str, adom: str = "root", verify: bool = True, connect_timeout: float = 10, read_timeout: float = 300, proxy_timeout: int = 60, proxy_chunk_size: int = 50, page_size: int = 1000, scope_chunk_size: int = 100, pool_connections: int = 1, pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True, cache: ResponseCache = None, limiter: RateLimiter = None, retry: RetryPolicy = None, circuit_breaker: CircuitBreaker = None, hooks: list = None, transport=None, **kwargs):
         self.host = host
         self.token = token
         self.adom = adom
         self.verify = verify
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
         self.proxy_timeout = proxy_timeout
+        self.proxy_chunk_size = proxy_chunk_size
+        self.page_size = page_size
+        self.scope_chunk_size = scope_chunk_size
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.limiter = limiter
+        # None means the default policy. RetryPolicy(retries=0) turns retries off.
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.hooks = list(hooks or [])
+        self._transport = transport
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def session(self):
+        """The HTTP session shared by all models. Created on first use.
+
+        Connections are pooled per host, so repeated calls reuse the same TCP and TLS connection.
+        """
+
+        with self._session_lock:
+            if self._session is None:
+                # Imported on first use, so importing the package and the asyncio API stays cheap
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+
+                if not self.keep_alive:
+                    session.headers["Connection"] = "close"
+
+                self._session = session
+
+        return self._session
+
+    def close(self):
+        """Closes the HTTP session and all pooled connections, and the transport.
+        """
+
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+        if self._transport is not None:
+            self._transport.close()
 
     @property
+    def transport(self):
+        """Transport that sends the requests of the sync API. Defaults to an HttpTransport, created on first use.
+        """
+
+        if self._transport is None:
+            from pyfortimanager.core.transport import HttpTransport
+
+            self._transport = HttpTransport()
+
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = transport
+
+    def deadline(self, seconds: float):
+        """Limits the total time of the calls made inside a with block, including retries.
+
+        Args:
+            seconds (float): Seconds from now until the deadline.
+
+        Returns:
+            contextmanager: Ex. with fortimanager.deadline(30): fortimanager.fortigates.all()
+        """
+
+        return deadline(seconds)
+
+    def _model(self, model: type):
+        """Instantiates a model bound to this API.
+        """
+
+        return model(api=self)
+
+    def _load(self, module: str, name: str):
+        """Imports a model from pyfortimanager.models and instantiates it bound to this API.
+        """
+
+        return self._model(getattr(importlib.import_module(f"pyfortimanager.models.{module}"), name))
+
+    def batch(self, max_items: int = 100, max_bytes: int = 1000000):
+        """Collects calls and sends them together as one or more multi-params requests.
+
+        Args:
+            max_items (int): Maximum number of calls in a single request. Default is 100.
+            max_bytes (int): Maximum size of the params in a single request. Default is 1000000.
+
+        Returns:
+            Batch: Use as a context manager to send the calls on exit, or call send() yourself.
+        """
+
+        return Batch(api=self, max_items=max_items, max_bytes=max_bytes)
+
+    def fleet(self, fortigates: list, func, max_workers: int = None, progress=None, argument: str = "fortigate", **kwargs):
+        """Runs a model method for many FortiGates in parallel. Errors are captured per FortiGate instead of being raised.
+
+        Args:
+            fortigates (list): Names of the FortiGates.
+            func (callable): Bound model method, e.g. fortimanager.fortigates_proxy.status.
+            max_workers (int, optional): Number of worker threads. Defaults to pool_maxsize, so every worker has a pooled connection.
+            progress (callable, optional): Called as progress(done, total, fortigate) after each call.
+            argument (str): Name of the argument func takes the FortiGate name in. Default is fortigate.
+            **kwargs: Extra arguments passed to every call. Ex. adom="root", timeout=30
+
+        Returns:
+            dict: FleetResult(data, error) for each FortiGate, keyed by name.
+        """
+
+        return fleet.run(fortigates=fortigates, func=func, max_workers=max_workers or self.pool_maxsize, progress=progress, argument=argument, **kwargs)
+
+    def inventory(self, path: str = ":memory:", adom: str = None, fortiaps: bool = True, fortiswitches: bool = True):
+        """Takes a snapshot of the FortiGates, FortiAPs, FortiSwitches, device groups and policy packages into a local SQLite database.
+
+        Args:
+            path (str): SQLite database file. Default is :memory:.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fortiaps (bool): Include the FortiAPs. Default is True.
+            fortiswitches (bool): Include the FortiSwitches. Default is True.
+
+        Returns:
+            Inventory: Query the snapshot with fortigates(), fortiaps(), fortiswitches(), device_groups(), policy_packages(), count() and query().
+        """
+
+        from pyfortimanager.core.inventory import Inventory
+
+        return Inventory(path=path).snapshot(api=self, adom=adom, fortiaps=fortiaps, fortiswitches=fortiswitches)
+
+    def task_waiter(self, interval: float = 1, max_interval: float = 30, backoff: float = 1.5, max_errors: int = 3):
+        """Follows many FortiManager tasks at once, with a single /task/task query per poll.
+
+        Args:
+            interval (float): Seconds between polls while tasks make progress. Default is 1.
+            max_interval (float): Maximum seconds between polls. Default is 30.
+            backoff (float): Factor to grow the interval by when no task made progress. Default is 1.5.
+            max_errors (int): Number of failed polls in a row before the pending tasks fail. Default is 3.
+
+        Returns:
+            TaskWaiter: Use watch() to get a future for each task, or wait() for a list of tasks.
+        """
+
+        return TaskWaiter(api=self, interval=interval, max_interval=max_interval, backoff=backoff, max_errors=max_errors)
+
+    @cached_property
     def adoms(self):
         """Endpoints related to ADOM management.
         """
-        return ADOMs(api=self)
+        return self._load("adoms", "ADOMs")
 
-    @property
+    @cached_property
     def cli_template_groups(self):
         """Endpoints related to CLI Template Groups.
         """
-        return CLI_Template_Groups(api=self)
+        return self._load("cli_template_groups", "CLI_Template_Groups")
 
-    @property
+    @cached_property
     def device_groups(self):
         """Endpoints related to Device Groups.
         """
-        return Device_Groups(api=self)
+        return self._load("device_groups", "Device_Groups")
 
-    @property
+    @cached_property
     def fortiaps_proxy(self):
         """Endpoints related to FortiAP proxy calls on a FortiGate.
         """
-        return FortiAPs_Proxy(api=self)
+        return self._load("fortiaps_proxy", "FortiAPs_Proxy")
 
-    @property
+    @cached_property
     def fortiaps(self):
         """Endpoints related to FortiAP management.
         """
-        return FortiAPs(api=self)
+        return self._load("fortiaps", "FortiAPs")
 
-    @property
+    @cached_property
     def fortigates_proxy(self):
         """Endpoints related to proxy calls on a FortiGate.
         """
-        return FortiGates_Proxy(api=self)
+        return self._load("fortigates_proxy", "FortiGates_Proxy")
 
-    @property
+    @cached_property
     def fortigates(self):
         """Endpoints related to FortiGate management.
         """
-        return FortiGates(api=self)
+        return self._load("fortigates", "FortiGates")
 
-    @property
+    @cached_property
     def fortiswitches_proxy(self):
         """Endpoints related to FortiSwitch proxy calls on a FortiGate.
         """
-        return FortiSwitches_Proxy(api=self)
+        return self._load("fortiswitches_proxy", "FortiSwitches_Proxy")
 
-    @property
+    @cached_property
     def fortiswitches(self):
         """Endpoints related to FortiSwitch management.
         """
-        return FortiSwitches(api=self)
+        return self._load("fortiswitches", "FortiSwitches")
 
-    @property
+    @cached_property
     def install_wizard(self):
         """Endpoints related to the Install Wizard.
         """
-        return Install_Wizard(api=self)
+        return self._load("install_wizard", "Install_Wizard")
 
-    @property
+    @cached_property
     def metadata_variables(self):
         """Endpoints related to Metadata Variables.
         """
-        return MetadataVariables(api=self)
+        return self._load("metadata_variables", "MetadataVariables")
 
-    @property
+    @cached_property
     def policy_packages(self):
         """Endpoints related to Policy Packages.
         """
-        return Policy_Packages(api=self)
+        return self._load("policy_packages", "Policy_Packages")
 
-    @property
+    @cached_property
     def radius_servers(self):
         """Endpoints related to RADIUS_Servers.
         """
-        return RADIUS_Servers(api=self)
+        return self._load("radius_servers", "RADIUS_Servers")
 
-    @property
+    @cached_property
     def scripts(self):
         """Endpoints related to Scripts.
         """
-        return Scripts(api=self)
+        return self._load("scripts", "Scripts")
 
-    @property
+    @cached_property
     def sdwan_templates(self):
         """Endpoints related to SD-WAN Templates.
         """
-        return SDWAN_Templates(api=self)
+        return self._load("sdwan_templates", "SDWAN_Templates")
 
-    @property
+    @cached_property
     def system(self):
         """Endpoints related to the FortiManager system.
         """
-        return System(api=self)
+        return self._load("system", "System")
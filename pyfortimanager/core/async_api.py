@@ -0,0 +1,469 @@
+import asyncio
+import contextvars
+import inspect
+import json
+import time
+from functools import lru_cache, partial
+
+from pyfortimanager.core import fleet
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.batch import Batch
+from pyfortimanager.core.deadline import remaining
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.metrics import RequestInfo
+from pyfortimanager.core.streaming import DataDecoder
+from pyfortimanager.core.tasks import TaskWaiter
+from pyfortimanager.core.utils import chunks
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncFortiManager(FortiManager):
+    """Model mixin that sends requests with aiohttp. post() returns a coroutine.
+    """
+
+    async def post(self, method: str, params: dict):
+        """Sends a POST request to the FortiManager API.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (dict): Payload data to send with the request.
+
+        Returns:
+            dict: JSON data.
+        """
+
+        cache = self.api.cache
+
+        if cache is not None:
+            cached = cache.get(method=method, params=params)
+
+            if cached is not None:
+                return cached
+
+        result = await self._request(method=method, params=[params])
+        result = result[0] if result else None
+
+        if cache is not None:
+            cache.update(method=method, params=params, response=result)
+
+        return result
+
+    async def stream(self, method: str, params: dict, chunk_size: int = 65536):
+        headers = {
+            "Authorization": f"Bearer {self.api.token}",
+            "Content-Type": "application/json"
+        }
+
+        data = {
+            "method": method,
+            "params": [params]
+        }
+
+        kwargs = {}
+
+        if not self.api.verify:
+            kwargs['ssl'] = False
+
+        body = json.dumps(data).encode()
+        decoder = DataDecoder(url=params.get('url'))
+        timeout = self._client_timeout(params=[params])
+
+        if timeout is None:
+            raise FortiManagerError(status={"code": -1, "message": "Deadline exceeded"}, url=params.get('url'))
+
+        info = RequestInfo(method=method, params=[params], payload_bytes=len(body))
+        self._hook("before", info)
+        start = time.perf_counter()
+
+        try:
+            if self.api.circuit_breaker is not None and not self.api.circuit_breaker.allow():
+                raise FortiManagerError(status={"code": -1, "message": "Circuit breaker is open, the FortiManager is unavailable"}, url=params.get('url'))
+
+            info.attempts = 1
+
+            try:
+                async with self._slot(method=method, params=[params]), self.api.session.post(url=self.base_url, data=body, headers=headers, timeout=timeout, **kwargs) as response:
+                    info.http_status = response.status
+                    self._reached(http_status=response.status)
+
+                    # HTTP 200 OK
+                    if response.status != 200:
+                        raise FortiManagerError(status={"code": -1, "message": f"HTTP {response.status}"}, url=params.get('url'))
+
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        info.response_bytes += len(chunk)
+
+                        for item in decoder.feed(chunk):
+                            yield item
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                self._reached(http_status=None)
+                raise FortiManagerError(status={"code": -1, "message": f"Connection error: {error or type(error).__name__}"}, url=params.get('url')) from error
+            except BaseException:
+                self._released()
+                raise
+
+            items = decoder.close()
+            info.code = 0
+        except FortiManagerError as error:
+            info.code = error.code
+            raise
+        finally:
+            info.elapsed = time.perf_counter() - start
+            self._hook("after", info)
+
+        for item in items:
+            yield item
+
+    async def _drive(self, steps):
+        result, error = None, None
+
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(result)
+            except StopIteration as stop:
+                return stop.value
+
+            result, error = None, None
+
+            # Errors, cancellation included, are raised inside the steps, so their with and finally blocks run
+            try:
+                if inspect.isawaitable(step):
+                    result = await step
+                elif hasattr(step, "__aiter__"):
+                    result = [item async for item in step]
+                else:
+                    result = step
+            except BaseException as exception:
+                error = exception
+
+    async def _records(self, response, record: type):
+        return FortiManager._records(await response, record)
+
+    async def _iter_records(self, items, record: type):
+        async for item in items:
+            yield record(item)
+
+    async def _paginate(self, params: dict, page_size: int = None):
+        page_size = page_size or self.api.page_size
+        offset = 0
+
+        while True:
+            response = await self.post(method="get", params=dict(params, range=[offset, page_size]))
+            data = self._page(response, params)
+
+            for record in data:
+                yield record
+
+            if len(data) < page_size:
+                return
+
+            offset += page_size
+
+    async def _chunked(self, method: str, params: dict, chunk_size: int = None):
+        return [await self.post(method=method, params=dict(params, data=chunk)) for chunk in chunks(params['data'], chunk_size or self.api.scope_chunk_size)]
+
+    async def _proxy(self, fortigate, params: dict, adom: str = None):
+        if isinstance(fortigate, str):
+            return await self.post(method="exec", params=self._proxy_params(params, [fortigate], adom=adom))
+
+        results = {}
+
+        for chunk in chunks(fortigate, self.api.proxy_chunk_size):
+            results.update(self._proxy_split(chunk, await self.post(method="exec", params=self._proxy_params(params, chunk, adom=adom))))
+
+        return results
+
+    def _client_timeout(self, params: list):
+        """Returns the aiohttp timeouts for a request, or None if the deadline has passed.
+        """
+
+        timeouts = self._timeouts(params=params)
+
+        if timeouts is None:
+            return None
+
+        return aiohttp.ClientTimeout(total=remaining(), sock_connect=timeouts[0], sock_read=timeouts[1])
+
+    async def _request(self, method: str, params: list):
+        """Sends a single JSON-RPC request with one or more params to the FortiManager API.
+
+        Idempotent requests that fail are retried by the retry policy of the API. If the request
+        still fails, or the circuit breaker is open, every payload gets an error status instead.
+        The hooks of the API are called before and after the request.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (list): List of payloads. FortiManager returns one result per payload, in the same order.
+
+        Returns:
+            list: JSON data for each payload.
+        """
+
+        data = {
+            "method": method,
+            "params": params
+        }
+
+        body = json.dumps(data).encode()
+        info = RequestInfo(method=method, params=params, payload_bytes=len(body))
+        self._hook("before", info)
+        start = time.perf_counter()
+
+        try:
+            results = await self._send(method=method, params=params, body=body, info=info)
+            info.set_results(results)
+        finally:
+            info.elapsed = time.perf_counter() - start
+            self._hook("after", info)
+
+        return results
+
+    async def _send(self, method: str, params: list, body: bytes, info: RequestInfo):
+        headers = {
+            "Authorization": f"Bearer {self.api.token}",
+            "Content-Type": "application/json"
+        }
+
+        kwargs = {}
+
+        if not self.api.verify:
+            kwargs['ssl'] = False
+
+        retries = self.api.retry.retries_for(method=method, params=params)
+
+        while True:
+            info.attempts += 1
+
+            timeout = self._client_timeout(params=params)
+
+            if timeout is None:
+                return self._errors(params=params, message="Deadline exceeded", attempts=info.attempts - 1)
+
+            if self.api.circuit_breaker is not None and not self.api.circuit_breaker.allow():
+                return self._errors(params=params, message="Circuit breaker is open, the FortiManager is unavailable", attempts=info.attempts - 1)
+
+            try:
+                async with self._slot(method=method, params=params), self.api.session.post(url=self.base_url, data=body, headers=headers, timeout=timeout, **kwargs) as response:
+                    content = await response.read()
+                    info.http_status = response.status
+                    info.response_bytes = len(content)
+
+                    # HTTP 200 OK
+                    if response.status == 200:
+                        self._reached(http_status=200)
+                        return json.loads(content)['result']
+
+                    http_status, retry_after, message = response.status, response.headers.get('Retry-After'), f"HTTP {response.status} {response.reason}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                http_status, retry_after, message = None, None, f"Connection error: {error or type(error).__name__}"
+            except BaseException:
+                self._released()
+                raise
+
+            retryable = self._reached(http_status=http_status) and info.attempts <= retries
+            delay = self.api.retry.delay(retry=info.attempts, retry_after=retry_after) if retryable else None
+
+            # Give up if the request cannot be retried, or the retry would start after the deadline
+            if delay is None or (remaining() is not None and remaining() <= delay):
+                return self._errors(params=params, message=message, attempts=info.attempts, http_status=http_status)
+
+            await asyncio.sleep(delay)
+
+
+@lru_cache(maxsize=None)
+def _async_model(model: type):
+    return type(model.__name__, (AsyncFortiManager, model), {})
+
+
+class AsyncBatch(Batch):
+    """Batch for the AsyncApi. Calls are queued the same way, but send() is a coroutine.
+    """
+
+    def __enter__(self):
+        raise TypeError("Use async with for the batch of an AsyncApi.")
+
+    def __exit__(self, *exc):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, *exc):
+        if exc_type is None:
+            await self.send()
+
+    async def send(self):
+        """Sends all queued calls and empties the queue. The results are also kept in results.
+
+        Returns:
+            list: JSON data for each queued call, in the order they were queued.
+        """
+
+        items, self.items = self.items, []
+        fortimanager = self.api._model(FortiManager)
+
+        for chunk in self._chunks(items):
+            results = await fortimanager._request(method=chunk[0].method, params=[item.params for item in chunk]) or []
+
+            for item, result in zip(chunk, results):
+                item.result = result
+
+            if self.api.cache is not None:
+                for item in chunk:
+                    self.api.cache.update(method=item.method, params=item.params, response=item.result)
+
+        self.results = [item.result for item in items]
+
+        return self.results
+
+
+class AsyncTaskWaiter(TaskWaiter):
+    """Task waiter for the AsyncApi. Polls from a background thread like TaskWaiter, but sends the
+    polls on the event loop it was created in. watch() returns an asyncio future and wait() is a coroutine.
+    """
+
+    def __init__(self, api, **kwargs):
+        super(AsyncTaskWaiter, self).__init__(api=api, **kwargs)
+        self._loop = asyncio.get_running_loop()
+
+    def watch(self, task, callback=None):
+        return asyncio.wrap_future(super(AsyncTaskWaiter, self).watch(task, callback=callback), loop=self._loop)
+
+    async def wait(self, tasks: list, timeout: float = None, return_exceptions: bool = False):
+        futures = self._watch_all(tasks)
+
+        if futures:
+            await asyncio.wait(list(futures.values()), timeout=timeout)
+
+        return self._results(futures, return_exceptions=return_exceptions)
+
+    def _get(self, params: dict):
+        return asyncio.run_coroutine_threadsafe(super(AsyncTaskWaiter, self)._get(params=params), self._loop).result()
+
+
+class AsyncApi(Api):
+    """Asyncio API class. Requires aiohttp.
+
+    Exposes the same models as Api, but every model method that returns the response as-is
+    returns a coroutine instead, e.g. await fortimanager.fortigates.all().
+
+    Connections are pooled on one aiohttp connector. pool_maxsize limits the number of concurrent
+    connections per host, and pool_connections * pool_maxsize the total number of connections.
+    """
+
+    def __init__(self, host: str, token: str, **kwargs):
+        if aiohttp is None:
+            raise ImportError("AsyncApi requires aiohttp. Install it with: pip install pyfortimanager[async]")
+
+        if kwargs.get('transport') is not None:
+            raise TypeError("AsyncApi sends with aiohttp and does not use a transport. Record and replay with the regular Api.")
+
+        super(AsyncApi, self).__init__(host=host, token=token, **kwargs)
+
+    def __enter__(self):
+        raise TypeError("Use async with for an AsyncApi.")
+
+    def __exit__(self, *exc):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def session(self):
+        """The aiohttp session shared by all models. Created on first use inside the event loop.
+        """
+
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_connections * self.pool_maxsize,
+                limit_per_host=self.pool_maxsize,
+                force_close=not self.keep_alive
+            )
+
+            self._session = aiohttp.ClientSession(connector=connector)
+
+        return self._session
+
+    async def close(self):
+        """Closes the aiohttp session and all pooled connections.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _model(self, model: type):
+        return _async_model(model)(api=self)
+
+    async def fleet(self, fortigates: list, func, max_workers: int = None, progress=None, argument: str = "fortigate", **kwargs):
+        """Runs a model method for many FortiGates concurrently. Errors are captured per FortiGate instead of being raised.
+
+        Args:
+            fortigates (list): Names of the FortiGates.
+            func (callable): Bound model method, e.g. fortimanager.fortigates_proxy.status.
+            max_workers (int, optional): Number of calls in flight at the same time. Defaults to pool_maxsize.
+            progress (callable, optional): Called as progress(done, total, fortigate) after each call.
+            argument (str): Name of the argument func takes the FortiGate name in. Default is fortigate.
+            **kwargs: Extra arguments passed to every call.
+
+        Returns:
+            dict: FleetResult(data, error) for each FortiGate, keyed by name.
+        """
+
+        return await fleet.run_async(fortigates=fortigates, func=func, max_workers=max_workers or self.pool_maxsize, progress=progress, argument=argument, **kwargs)
+
+    def task_waiter(self, interval: float = 1, max_interval: float = 30, backoff: float = 1.5, max_errors: int = 3):
+        """Follows many FortiManager tasks at once, with a single /task/task query per poll. Must be called inside the event loop.
+
+        Returns:
+            AsyncTaskWaiter: Await the futures from watch(), or await wait() for a list of tasks.
+        """
+
+        return AsyncTaskWaiter(api=self, interval=interval, max_interval=max_interval, backoff=backoff, max_errors=max_errors)
+
+    async def inventory(self, path: str = ":memory:", adom: str = None, fortiaps: bool = True, fortiswitches: bool = True):
+        """Takes a snapshot of the FortiGates, FortiAPs, FortiSwitches, device groups and policy packages into a local SQLite database.
+
+        The snapshot is taken in a worker thread by a regular Api with the same settings, cache, limiter,
+        retry policy, circuit breaker and hooks, so writing the database does not block the event loop.
+
+        Returns:
+            Inventory: Query the snapshot with fortigates(), fortiaps(), fortiswitches(), device_groups(), policy_packages(), count() and query().
+        """
+
+        api = Api(
+            host=self.host, token=self.token, adom=self.adom, verify=self.verify, connect_timeout=self.connect_timeout, read_timeout=self.read_timeout,
+            proxy_timeout=self.proxy_timeout, proxy_chunk_size=self.proxy_chunk_size, page_size=self.page_size, scope_chunk_size=self.scope_chunk_size,
+            pool_maxsize=self.pool_maxsize, keep_alive=self.keep_alive, cache=self.cache, limiter=self.limiter, retry=self.retry,
+            circuit_breaker=self.circuit_breaker, hooks=self.hooks
+        )
+
+        # Copy the context, so the deadline of the caller also applies in the thread
+        snapshot = partial(contextvars.copy_context().run, api.inventory, path=path, adom=adom, fortiaps=fortiaps, fortiswitches=fortiswitches)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, snapshot)
+        finally:
+            api.close()
+
+    def batch(self, max_items: int = 100, max_bytes: int = 1000000):
+        """Collects calls and sends them together as one or more multi-params requests.
+
+        Args:
+            max_items (int): Maximum number of calls in a single request. Default is 100.
+            max_bytes (int): Maximum size of the params in a single request. Default is 1000000.
+
+        Returns:
+            AsyncBatch: Use as an async context manager to send the calls on exit, or await send() yourself.
+        """
+
+        return AsyncBatch(api=self, max_items=max_items, max_bytes=max_bytes)
@@ -0,0 +1,126 @@
+import json
+from functools import lru_cache
+
+from pyfortimanager.core.fortimanager import FortiManager
+
+
+class BatchItem(object):
+    """A call queued in a batch. The result is set once the batch has been sent.
+    """
+
+    __slots__ = ("method", "params", "size", "result")
+
+    def __init__(self, method: str, params: dict):
+        self.method = method
+        self.params = params
+        self.size = len(json.dumps(params))
+        self.result = None
+
+
+class _Queued(FortiManager):
+    """Model mixin that queues calls on the batch instead of sending them.
+    """
+
+    def post(self, method: str, params: dict):
+        return self.api.queue(method=method, params=params)
+
+
+@lru_cache(maxsize=None)
+def _queued_model(model: type):
+    return type(model.__name__, (_Queued, model), {})
+
+
+class Batch(object):
+    """Collects calls made through the models and sends them as multi-params JSON-RPC requests.
+
+    Every model available on the API is available on the batch, e.g. batch.fortigates.update(...).
+    Calls made through the batch return a BatchItem instead of the JSON data. Consecutive calls with
+    the same method are combined into one request, split by max_items and max_bytes.
+
+    Only model methods that return the response as-is can be batched.
+    """
+
+    def __init__(self, api, max_items: int = 100, max_bytes: int = 1000000):
+        self.api = api
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items = []
+        self.results = []
+
+    def __getattr__(self, name):
+        value = getattr(self.api, name)
+
+        # Rebind models to the batch, everything else comes from the API.
+        if isinstance(value, FortiManager):
+            return _queued_model(type(value))(api=self)
+
+        return value
+
+    def __len__(self):
+        return len(self.items)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.send()
+
+    def queue(self, method: str, params: dict):
+        """Queues a call to be sent with the batch.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (dict): Payload data to send with the request.
+
+        Returns:
+            BatchItem: The queued call.
+        """
+
+        item = BatchItem(method=method, params=params)
+        self.items.append(item)
+
+        return item
+
+    def send(self):
+        """Sends all queued calls and empties the queue. The results are also kept in results.
+
+        Returns:
+            list: JSON data for each queued call, in the order they were queued.
+        """
+
+        items, self.items = self.items, []
+        fortimanager = FortiManager(api=self.api)
+
+        for chunk in self._chunks(items):
+            results = fortimanager._request(method=chunk[0].method, params=[item.params for item in chunk]) or []
+
+            for item, result in zip(chunk, results):
+                item.result = result
+
+            if self.api.cache is not None:
+                for item in chunk:
+                    self.api.cache.update(method=item.method, params=item.params, response=item.result)
+
+        self.results = [item.result for item in items]
+
+        return self.results
+
+    def _chunks(self, items: list):
+        """Splits the queued calls into requests of consecutive calls with the same method.
+        """
+
+        chunk = []
+        size = 0
+
+        for item in items:
+            if chunk and (item.method != chunk[0].method or len(chunk) >= self.max_items or size + item.size > self.max_bytes):
+                yield chunk
+                chunk = []
+                size = 0
+
+            chunk.append(item)
+            size += item.size
+
+        if chunk:
+            yield chunk
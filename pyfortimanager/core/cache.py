@@ -0,0 +1,151 @@
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """In-memory LRU cache for read-only calls, with a time to live per URL prefix.
+
+    get calls, and exec calls to the read-only URLs in READ_ONLY_EXEC, are cached.
+    Any other call invalidates the cached responses for its URL, including the responses
+    for URLs above or below it, e.g. an update of /dvmdb/adom/root/device/FGT-1
+    invalidates /dvmdb/adom/root/device. Calls to the URLs in RELATED also invalidate
+    the URLs they change indirectly.
+
+    Args:
+        ttls (dict, optional): Seconds to keep responses for each URL prefix. The longest matching prefix is used, and 0 disables caching. Ex. {"/dvmdb/adom": 300, "/pm/config": 0}
+            Tasks are never cached, unless a TTL is set for /task.
+        default_ttl (float): Seconds to keep responses for URLs without a matching prefix. Default is 60.
+        maxsize (int): Maximum number of cached responses. The least recently used response is dropped first. Default is 1024.
+    """
+
+    READ_ONLY_EXEC = (
+        "/um/image/version/list",
+    )
+
+    RELATED = (
+        ("/dvm/cmd/", "/dvmdb/"),
+        ("/um/image/upgrade/", "/dvmdb/"),
+        ("/pm/config/device/", "/pm/config/adom/"),
+        ("/securityconsole/", "/pm/"),
+        ("/deployment/", "/pm/config/"),
+    )
+
+    def __init__(self, ttls: dict = None, default_ttl: float = 60, maxsize: int = 1024):
+        self.ttls = sorted(dict({"/task/": 0}, **(ttls or {})).items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, url: str):
+        """Returns the time to live for a URL.
+        """
+
+        for prefix, ttl in self.ttls:
+            if url.startswith(prefix):
+                return ttl
+
+        return self.default_ttl
+
+    def read_only(self, method: str, params: dict):
+        """Returns True if the call does not change anything, i.e. a get call or an exec call to a URL in READ_ONLY_EXEC.
+        """
+
+        return method == "get" or (method == "exec" and (params.get('url') or "") in self.READ_ONLY_EXEC)
+
+    def cacheable(self, method: str, params: dict):
+        """Returns True if the call is read-only and has a time to live.
+        """
+
+        return self.read_only(method, params) and self.ttl(params.get('url') or "") > 0
+
+    def get(self, method: str, params: dict):
+        """Returns a copy of the cached response for a call, or None.
+        """
+
+        if not self.cacheable(method, params):
+            return None
+
+        key = self._key(method, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(entry[2])
+
+    def update(self, method: str, params: dict, response: dict):
+        """Caches the response of a read-only call, or invalidates the URL of a call that changes something.
+
+        Read-only calls without a time to live, e.g. task polls, are neither cached nor invalidate anything.
+        """
+
+        url = params.get('url') or ""
+
+        if not self.read_only(method, params):
+            self.invalidate(url)
+            return
+
+        if not self.cacheable(method, params):
+            return
+
+        # Only successful responses are cached
+        if not response or response.get('status', {}).get('code') != 0:
+            return
+
+        with self._lock:
+            self._entries[self._key(method, params)] = (time.monotonic() + self.ttl(url), url, copy.deepcopy(response))
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url: str = None):
+        """Drops the cached responses for a URL, or all cached responses.
+
+        Args:
+            url (str, optional): URL that was changed. Defaults to all URLs.
+        """
+
+        if url:
+            url = "/" + url.strip("/")
+            prefixes = [url] + [related for prefix, related in self.RELATED if url.startswith(prefix)]
+        else:
+            prefixes = []
+
+        with self._lock:
+            if not prefixes:
+                self._entries.clear()
+                return
+
+            for key, (expires, cached_url, response) in list(self._entries.items()):
+                if any(cached_url.startswith(prefix) or prefix.startswith(cached_url) for prefix in prefixes):
+                    del self._entries[key]
+
+    def stats(self):
+        """Returns the number of hits, misses and cached responses.
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries)
+        }
+
+    @staticmethod
+    def _key(method: str, params: dict):
+        return method, json.dumps(params, sort_keys=True, default=str)
@@ -0,0 +1,46 @@
+import contextvars
+import time
+from contextlib import contextmanager
+
+
+_deadline = contextvars.ContextVar("pyfortimanager_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """Limits the total time of the calls made inside the block, including retries.
+
+    Requests get a timeout of at most the time left, and calls made after the deadline has
+    passed fail without being sent. Nested deadlines can only shorten the time left.
+
+    The deadline follows the context, so it applies to asyncio tasks started inside the block,
+    but not to threads started inside it, e.g. by Api.fleet().
+
+    Args:
+        seconds (float): Seconds from now until the deadline.
+    """
+
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+
+    if current is not None:
+        at = min(at, current)
+
+    token = _deadline.set(at)
+
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining():
+    """Returns the seconds left until the current deadline, or None without a deadline.
+    """
+
+    at = _deadline.get()
+
+    if at is None:
+        return None
+
+    return at - time.monotonic()
@@ -0,0 +1,15 @@
+class FortiManagerError(Exception):
+    """Raised when FortiManager returns an error status for a call.
+
+    Attributes:
+        status (dict): The status object from FortiManager.
+        code (int): FortiManager status code.
+        url (str): URL of the call.
+    """
+
+    def __init__(self, status: dict = None, url: str = None):
+        self.status = status or {"code": -1, "message": "No response from the FortiManager"}
+        self.code = self.status.get('code')
+        self.url = url
+
+        super(FortiManagerError, self).__init__(f"{url}: {self.status.get('message')} (code {self.code})")
@@ -0,0 +1,67 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+FleetResult = namedtuple("FleetResult", ["data", "error"])
+FleetResult.__doc__ = """Result of a call for a single device. error holds the exception raised by the call, if any."""
+
+
+def run(fortigates: list, func, max_workers: int, progress=None, argument: str = "fortigate", **kwargs):
+    """Calls func once for each FortiGate on a bounded thread pool.
+
+    Args:
+        fortigates (list): Names of the FortiGates.
+        func (callable): Bound model method, e.g. fortimanager.fortigates_proxy.status.
+        max_workers (int): Maximum number of calls running at the same time.
+        progress (callable, optional): Called as progress(done, total, fortigate) after each call.
+        argument (str): Name of the argument func takes the FortiGate name in. Default is fortigate.
+        **kwargs: Extra arguments passed to every call.
+
+    Returns:
+        dict: FleetResult for each FortiGate, keyed by name, in the order given.
+    """
+
+    results = {}
+    total = len(fortigates)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(func, **{argument: fortigate}, **kwargs): fortigate for fortigate in fortigates}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            fortigate = futures[future]
+
+            try:
+                results[fortigate] = FleetResult(data=future.result(), error=None)
+            except Exception as error:
+                results[fortigate] = FleetResult(data=None, error=error)
+
+            if progress:
+                progress(done, total, fortigate)
+
+    return {fortigate: results[fortigate] for fortigate in fortigates}
+
+
+async def run_async(fortigates: list, func, max_workers: int, progress=None, argument: str = "fortigate", **kwargs):
+    """Same as run(), for coroutine functions. Calls are run on the event loop, at most max_workers at a time.
+    """
+
+    # Imported here, so the sync API does not import asyncio
+    import asyncio
+
+    results = {}
+    total = len(fortigates)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def call(fortigate):
+        async with semaphore:
+            try:
+                results[fortigate] = FleetResult(data=await func(**{argument: fortigate}, **kwargs), error=None)
+            except Exception as error:
+                results[fortigate] = FleetResult(data=None, error=error)
+
+        if progress:
+            progress(len(results), total, fortigate)
+
+    await asyncio.gather(*[call(fortigate) for fortigate in fortigates])
+
+    return {fortigate: results[fortigate] for fortigate in fortigates}
@@ -1,10 +1,21 @@
-import requests
+import json
+import time
+
+from pyfortimanager.core.deadline import remaining
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.limiter import Slot
+from pyfortimanager.core.metrics import RequestInfo
+from pyfortimanager.core.streaming import DataDecoder
+from pyfortimanager.core.utils import chunks
 
 
 class FortiManager(object):
     """API class for FortiManager login management and post requests.
     """
 
+    # Seconds to wait for a proxy call on top of the timeout FortiManager waits for the FortiGates.
+    PROXY_TIMEOUT_MARGIN = 5
+
     def __init__(self, api, **kwargs):
         self.api = api
         self.base_url = f"{self.api.host}/jsonrpc"
@@ -20,8 +31,45 @@ class FortiManager(object):
             dict: JSON data.
         """
 
+        cache = self.api.cache
+
+        if cache is not None:
+            cached = cache.get(method=method, params=params)
+
+            if cached is not None:
+                return cached
+
+        result = self._request(method=method, params=[params])
+        result = result[0] if result else None
+
+        if cache is not None:
+            cache.update(method=method, params=params, response=result)
+
+        return result
+
+    def stream(self, method: str, params: dict, chunk_size: int = 65536):
+        """Sends a POST request to the FortiManager API and yields the items in data as they are decoded.
+
+        The response body is read in chunks, so neither the body nor the full result is held in memory.
+        Responses are not cached.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (dict): Payload data to send with the request.
+            chunk_size (int): Number of bytes to read at a time. Default is 65536.
+
+        Raises:
+            FortiManagerError: FortiManager returned an error status, the connection failed, or the circuit breaker is open.
+
+        Returns:
+            generator: JSON data for each item.
+        """
+
+        import requests
+
         headers = {
-            "Authorization": f"Bearer {self.api.token}"
+            "Authorization": f"Bearer {self.api.token}",
+            "Content-Type": "application/json"
         }
 
         data = {
@@ -29,8 +77,374 @@ class FortiManager(object):
             "params": [params]
         }
 
-        response = requests.post(url=self.base_url, json=data, verify=self.api.verify, headers=headers)
+        body = json.dumps(data).encode()
+        decoder = DataDecoder(url=params.get('url'))
+        timeout = self._timeouts(params=[params])
+
+        if timeout is None:
+            raise FortiManagerError(status={"code": -1, "message": "Deadline exceeded"}, url=params.get('url'))
+
+        info = RequestInfo(method=method, params=[params], payload_bytes=len(body))
+        self._hook("before", info)
+        start = time.perf_counter()
+
+        try:
+            if self.api.circuit_breaker is not None and not self.api.circuit_breaker.allow():
+                raise FortiManagerError(status={"code": -1, "message": "Circuit breaker is open, the FortiManager is unavailable"}, url=params.get('url'))
+
+            info.attempts = 1
+
+            try:
+                with self._slot(method=method, params=[params]), self.api.transport.send(api=self.api, url=self.base_url, body=body, headers=headers, timeout=timeout, stream=True) as response:
+                    info.http_status = response.status_code
+                    self._reached(http_status=response.status_code)
+
+                    # HTTP 200 OK
+                    if response.status_code != 200:
+                        raise FortiManagerError(status={"code": -1, "message": f"HTTP {response.status_code}"}, url=params.get('url'))
+
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        info.response_bytes += len(chunk)
+                        yield from decoder.feed(chunk)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                self._reached(http_status=None)
+                raise FortiManagerError(status={"code": -1, "message": f"Connection error: {error}"}, url=params.get('url')) from error
+            except BaseException:
+                self._released()
+                raise
+
+            items = decoder.close()
+            info.code = 0
+        except FortiManagerError as error:
+            info.code = error.code
+            raise
+        finally:
+            info.elapsed = time.perf_counter() - start
+            self._hook("after", info)
+
+        yield from items
+
+    @staticmethod
+    def _drive(steps):
+        """Runs a model method written as a generator of steps, so the Api and the AsyncApi share it.
+
+        Each step is the return value of a call, e.g. self.post(), batch.send(), waiter.wait() or an
+        iterator, and its result is sent back into the generator. The Api has the result already, so
+        it is sent back as-is. The AsyncApi awaits it, or collects an async iterator into a list.
+
+        Returns:
+            The return value of the generator.
+        """
+
+        result = None
+
+        try:
+            while True:
+                result = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    @staticmethod
+    def _records(response: dict, record: type):
+        """Replaces the data in a response with compact records.
+        """
+
+        if response and isinstance(response.get('data'), list):
+            response['data'] = [record(item) for item in response['data']]
+        elif response and isinstance(response.get('data'), dict):
+            response['data'] = record(response['data'])
+
+        return response
+
+    @staticmethod
+    def _iter_records(items, record: type):
+        """Turns the items from a generator into compact records.
+        """
+
+        return (record(item) for item in items)
+
+    def _paginate(self, params: dict, page_size: int = None):
+        """Retrieves a table page by page with the range option and yields one record at a time.
+
+        Args:
+            params (dict): Payload for the get request.
+            page_size (int, optional): Number of records per request. Defaults to the page_size set when the API was instantiated.
+
+        Raises:
+            FortiManagerError: A page could not be retrieved.
+
+        Returns:
+            generator: The records.
+        """
+
+        page_size = page_size or self.api.page_size
+        offset = 0
+
+        while True:
+            response = self.post(method="get", params=dict(params, range=[offset, page_size]))
+            data = self._page(response, params)
+
+            yield from data
+
+            if len(data) < page_size:
+                return
+
+            offset += page_size
+
+    @staticmethod
+    def _page(response: dict, params: dict):
+        """Returns the records of a page, or raises if FortiManager returned an error.
+        """
+
+        if not response or response.get('status', {}).get('code') != 0:
+            raise FortiManagerError(status=(response or {}).get('status'), url=params['url'])
+
+        return response.get('data') or []
+
+    def _chunked(self, method: str, params: dict, chunk_size: int = None):
+        """Sends a call with a list in data as one call per chunk of the list.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (dict): Payload data with a list in data.
+            chunk_size (int, optional): Maximum number of items per call. Defaults to the scope_chunk_size set when the API was instantiated.
+
+        Returns:
+            list: JSON data for each chunk.
+        """
+
+        return [self.post(method=method, params=dict(params, data=chunk)) for chunk in chunks(params['data'], chunk_size or self.api.scope_chunk_size)]
+
+    def _proxy(self, fortigate, params: dict, adom: str = None):
+        """Sends a /sys/proxy/json call to one or many FortiGates.
+
+        A list of FortiGates is split into calls of proxy_chunk_size targets each, and the
+        combined responses are split per FortiGate.
+
+        Args:
+            fortigate (str | list): Name of the FortiGate, or a list of names.
+            params (dict): Payload for /sys/proxy/json without the target.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
+        """
+
+        if isinstance(fortigate, str):
+            return self.post(method="exec", params=self._proxy_params(params, [fortigate], adom=adom))
+
+        results = {}
+
+        for chunk in chunks(fortigate, self.api.proxy_chunk_size):
+            results.update(self._proxy_split(chunk, self.post(method="exec", params=self._proxy_params(params, chunk, adom=adom))))
+
+        return results
+
+    def _proxy_params(self, params: dict, fortigates: list, adom: str = None):
+        """Returns a copy of the /sys/proxy/json payload targeting the FortiGates.
+        """
+
+        data = dict(params['data'], target=[f"/adom/{adom or self.api.adom}/device/{fortigate}" for fortigate in fortigates])
+
+        return dict(params, data=data)
+
+    @staticmethod
+    def _proxy_split(fortigates: list, response: dict):
+        """Splits a /sys/proxy/json response into the response and status of each FortiGate.
+
+        FortiGates missing from the response get the status of the FortiManager call instead.
+        """
+
+        results = {}
+
+        if response:
+            for entry in response.get('data') or []:
+                results[entry.get('target')] = entry
+
+        if response and response.get('status', {}).get('code') == 0:
+            status = {"code": -1, "message": "No response from the FortiGate"}
+        else:
+            status = (response or {}).get('status') or {"code": -1, "message": "No response from the FortiManager"}
+
+        for fortigate in fortigates:
+            if fortigate not in results:
+                results[fortigate] = {
+                    "status": status,
+                    "target": fortigate
+                }
+
+        return {fortigate: results[fortigate] for fortigate in fortigates}
+
+    def _slot(self, method: str, params: list):
+        """Returns the rate limiter slot for a request, or a slot that does nothing without a rate limiter.
+        """
+
+        if self.api.limiter is None:
+            return Slot()
+
+        return self.api.limiter.slot(method=method, params=params)
+
+    def _request(self, method: str, params: list):
+        """Sends a single JSON-RPC request with one or more params to the FortiManager API.
+
+        Idempotent requests that fail are retried by the retry policy of the API. If the request
+        still fails, or the circuit breaker is open, every payload gets an error status instead.
+        The hooks of the API are called before and after the request.
+
+        Args:
+            method (str): get, exec, add, set, update, delete.
+            params (list): List of payloads. FortiManager returns one result per payload, in the same order.
+
+        Returns:
+            list: JSON data for each payload.
+        """
+
+        data = {
+            "method": method,
+            "params": params
+        }
+
+        body = json.dumps(data).encode()
+        info = RequestInfo(method=method, params=params, payload_bytes=len(body))
+        self._hook("before", info)
+        start = time.perf_counter()
+
+        try:
+            results = self._send(method=method, params=params, body=body, info=info)
+            info.set_results(results)
+        finally:
+            info.elapsed = time.perf_counter() - start
+            self._hook("after", info)
+
+        return results
+
+    def _send(self, method: str, params: list, body: bytes, info: RequestInfo):
+        """Sends the body of a request, with retries.
+        """
+
+        import requests
+
+        headers = {
+            "Authorization": f"Bearer {self.api.token}",
+            "Content-Type": "application/json"
+        }
+
+        retries = self.api.retry.retries_for(method=method, params=params)
+
+        while True:
+            info.attempts += 1
+
+            timeout = self._timeouts(params=params)
+
+            if timeout is None:
+                return self._errors(params=params, message="Deadline exceeded", attempts=info.attempts - 1)
+
+            if self.api.circuit_breaker is not None and not self.api.circuit_breaker.allow():
+                return self._errors(params=params, message="Circuit breaker is open, the FortiManager is unavailable", attempts=info.attempts - 1)
+
+            try:
+                with self._slot(method=method, params=params):
+                    response = self.api.transport.send(api=self.api, url=self.base_url, body=body, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                http_status, retry_after, message = None, None, f"Connection error: {error}"
+            except BaseException:
+                self._released()
+                raise
+            else:
+                info.http_status = response.status_code
+                info.response_bytes = len(response.content)
+
+                # HTTP 200 OK
+                if response.status_code == 200:
+                    self._reached(http_status=200)
+                    return response.json()['result']
+
+                http_status, retry_after, message = response.status_code, response.headers.get('Retry-After'), f"HTTP {response.status_code} {response.reason}"
+
+            retryable = self._reached(http_status=http_status) and info.attempts <= retries
+            delay = self.api.retry.delay(retry=info.attempts, retry_after=retry_after) if retryable else None
+
+            # Give up if the request cannot be retried, or the retry would start after the deadline
+            if delay is None or (remaining() is not None and remaining() <= delay):
+                return self._errors(params=params, message=message, attempts=info.attempts, http_status=http_status)
+
+            time.sleep(delay)
+
+    def _hook(self, name: str, info: RequestInfo):
+        """Calls the before or after method of each hook of the API that has it.
+        """
+
+        for hook in self.api.hooks:
+            callback = getattr(hook, name, None)
+
+            if callback is not None:
+                callback(info)
+
+    def _timeouts(self, params: list):
+        """Returns the connect and read timeouts for a request, or None if the deadline has passed.
+
+        The read timeout of proxy calls is the timeout in the payload plus PROXY_TIMEOUT_MARGIN,
+        so the client never waits much longer than FortiManager waits for the FortiGates.
+        """
+
+        connect = self.api.connect_timeout
+        read = self.api.read_timeout
+
+        proxy = [(payload.get('data') or {}).get('timeout') for payload in params if "/" + (payload.get('url') or "").strip("/") == "/sys/proxy/json"]
+
+        if proxy and all(proxy):
+            read = max(proxy) + self.PROXY_TIMEOUT_MARGIN
+
+        left = remaining()
+
+        if left is not None:
+            if left <= 0:
+                return None
+
+            connect = min(connect, left) if connect else left
+            read = min(read, left) if read else left
+
+        return connect, read
+
+    def _released(self):
+        """Releases the circuit breaker after an attempt that ended without an outcome, so a trial request cannot hold it half-open.
+        """
+
+        if self.api.circuit_breaker is not None:
+            self.api.circuit_breaker.release()
+
+    def _reached(self, http_status: int = None):
+        """Records the outcome of a request in the circuit breaker.
+
+        Returns:
+            bool: True if the request may be retried, i.e. the connection failed or the HTTP status is retryable.
+        """
+
+        if self.api.circuit_breaker is not None:
+            if http_status is None or http_status >= 500:
+                self.api.circuit_breaker.failure()
+            else:
+                self.api.circuit_breaker.success()
+
+        return http_status is None or http_status in self.api.retry.statuses
+
+    @staticmethod
+    def _errors(params: list, message: str, attempts: int, http_status: int = None):
+        """Returns an error result for each payload of a request that failed.
+
+        The status has code -1, like other client-side errors, with the HTTP status (None if the
+        connection failed) and the number of attempts made.
+        """
 
-        # HTTP 200 OK
-        if response.status_code == 200:
-            return response.json()['result'][0]
+        return [
+            {
+                "status": {
+                    "code": -1,
+                    "message": message,
+                    "http_status": http_status,
+                    "attempts": attempts
+                },
+                "url": payload.get('url')
+            }
+            for payload in params
+        ]
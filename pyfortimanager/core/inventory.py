@@ -0,0 +1,428 @@
+import json
+import sqlite3
+import time
+
+from pyfortimanager.core.exceptions import FortiManagerError
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS fortigates (
+    name TEXT PRIMARY KEY,
+    sn TEXT,
+    ip TEXT,
+    hostname TEXT,
+    platform TEXT,
+    os_ver INTEGER,
+    mr INTEGER,
+    patch INTEGER,
+    build INTEGER,
+    firmware TEXT,
+    conn_status INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS fortigates_sn ON fortigates (sn);
+CREATE INDEX IF NOT EXISTS fortigates_platform ON fortigates (platform);
+CREATE INDEX IF NOT EXISTS fortigates_firmware ON fortigates (os_ver, mr, patch);
+
+CREATE TABLE IF NOT EXISTS meta_fields (
+    fortigate TEXT,
+    field TEXT,
+    value TEXT,
+    PRIMARY KEY (fortigate, field)
+);
+CREATE INDEX IF NOT EXISTS meta_fields_value ON meta_fields (field, value);
+
+CREATE TABLE IF NOT EXISTS fortiaps (
+    sn TEXT PRIMARY KEY,
+    name TEXT,
+    fortigate TEXT,
+    vdom TEXT,
+    profile TEXT,
+    conn_state INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS fortiaps_fortigate ON fortiaps (fortigate);
+CREATE INDEX IF NOT EXISTS fortiaps_profile ON fortiaps (profile);
+
+CREATE TABLE IF NOT EXISTS fortiswitches (
+    sn TEXT PRIMARY KEY,
+    name TEXT,
+    fortigate TEXT,
+    vdom TEXT,
+    platform TEXT,
+    conn_state INTEGER,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS fortiswitches_fortigate ON fortiswitches (fortigate);
+CREATE INDEX IF NOT EXISTS fortiswitches_platform ON fortiswitches (platform);
+
+CREATE TABLE IF NOT EXISTS device_group_members (
+    device_group TEXT,
+    fortigate TEXT,
+    vdom TEXT,
+    PRIMARY KEY (device_group, fortigate, vdom)
+);
+CREATE INDEX IF NOT EXISTS device_group_members_fortigate ON device_group_members (fortigate);
+
+CREATE TABLE IF NOT EXISTS policy_package_members (
+    policy_package TEXT,
+    fortigate TEXT,
+    vdom TEXT,
+    PRIMARY KEY (policy_package, fortigate, vdom)
+);
+CREATE INDEX IF NOT EXISTS policy_package_members_fortigate ON policy_package_members (fortigate);
+"""
+
+# Columns the FortiGates can be counted by.
+COUNT_COLUMNS = ("platform", "firmware", "os_ver", "conn_status")
+
+
+class Inventory(object):
+    """Snapshot of the FortiGates, FortiAPs, FortiSwitches, device groups and policy packages of an ADOM in a local SQLite database.
+
+    Take a snapshot with Api.inventory(), or open a database written earlier with Inventory(path),
+    and run the reports against it without calling the FortiManager. The columns used by the
+    queries are indexed, and every entry keeps the full JSON data from the FortiManager.
+
+    Args:
+        path (str): SQLite database file. Default is :memory:.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        # The AsyncApi takes the snapshot in a worker thread and queries it from the event loop
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Closes the database.
+        """
+
+        self._connection.close()
+
+    @property
+    def info(self):
+        """The host, ADOM and time of the snapshot, and the number of entries in each collection.
+        """
+
+        info = {row['key']: row['value'] for row in self._connection.execute("SELECT key, value FROM snapshot")}
+        info['taken_at'] = float(info['taken_at']) if info.get('taken_at') else None
+
+        for table in ("fortigates", "fortiaps", "fortiswitches"):
+            info[table] = self._connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+        return info
+
+    def snapshot(self, api, adom: str = None, fortiaps: bool = True, fortiswitches: bool = True):
+        """Replaces the inventory with the current one from the FortiManager.
+
+        The FortiGates, FortiAPs and FortiSwitches are retrieved page by page and written to the
+        database as they arrive. The old snapshot is kept until the new one is complete.
+
+        Args:
+            api (Api): The API to retrieve the inventory with.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fortiaps (bool): Include the FortiAPs. Default is True.
+            fortiswitches (bool): Include the FortiSwitches. Default is True.
+
+        Raises:
+            FortiManagerError: A collection could not be retrieved.
+
+        Returns:
+            Inventory: The inventory.
+        """
+
+        adom = adom or api.adom
+
+        with self._connection:
+            for table in ("snapshot", "fortigates", "meta_fields", "fortiaps", "fortiswitches", "device_group_members", "policy_package_members"):
+                self._connection.execute(f"DELETE FROM {table}")
+
+            for fortigate in api.fortigates.iter_all(adom=adom):
+                self._add_fortigate(fortigate)
+
+            if fortiaps:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO fortiaps VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (item.get('wtp-id'), item.get('name'), *self._scope(item), item.get('wtp-profile'), item.get('_conn-state'), self._json(item))
+                        for item in api.fortiaps.iter_all(adom=adom)
+                    )
+                )
+
+            if fortiswitches:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO fortiswitches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (item.get('switch-id'), item.get('name'), *self._scope(item), item.get('_platform'), item.get('_conn-state'), self._json(item))
+                        for item in api.fortiswitches.iter_all(adom=adom)
+                    )
+                )
+
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO device_group_members VALUES (?, ?, ?)",
+                (
+                    (group['name'], member.get('name'), member.get('vdom'))
+                    for group in self._data(api.device_groups.all(adom=adom), f"/dvmdb/adom/{adom}/group")
+                    for member in group.get('object member') or []
+                )
+            )
+
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO policy_package_members VALUES (?, ?, ?)",
+                (
+                    (name, member.get('name'), member.get('vdom'))
+                    for name, package in self._packages(self._data(api.policy_packages.all(adom=adom), f"/pm/pkg/adom/{adom}"))
+                    for member in package.get('scope member') or []
+                )
+            )
+
+            self._connection.executemany(
+                "INSERT INTO snapshot VALUES (?, ?)",
+                (("host", api.host), ("adom", adom), ("taken_at", str(time.time())))
+            )
+
+        return self
+
+    def fortigates(self, serial: str = None, platform: str = None, firmware: str = None, group: str = None, policy_package: str = None, meta: dict = None, connected: bool = None):
+        """Returns the FortiGates that match all the given conditions.
+
+        Args:
+            serial (str, optional): Serial number.
+            platform (str, optional): Platform. Ex. FortiGate-60F.
+            firmware (str, optional): Firmware version, or the start of it. Ex. 7.2 or 7.2.5.
+            group (str, optional): Name of a device group the FortiGate is a member of.
+            policy_package (str, optional): Name of a policy package the FortiGate is in the scope of. Packages in folders are named folder/package.
+            meta (dict, optional): Values of meta fields. Ex. {"region": "north"}.
+            connected (bool, optional): Only FortiGates that are connected, or only those that are not.
+
+        Returns:
+            list: JSON data for each FortiGate, as retrieved in the snapshot.
+        """
+
+        conditions, parameters = [], []
+
+        if serial is not None:
+            conditions.append("sn = ?")
+            parameters.append(serial)
+
+        if platform is not None:
+            conditions.append("platform = ?")
+            parameters.append(platform)
+
+        if firmware is not None:
+            for column, value in zip(("os_ver", "mr", "patch"), str(firmware).lstrip("v").split(".")):
+                conditions.append(f"{column} = ?")
+                parameters.append(int(value))
+
+        if group is not None:
+            conditions.append("name IN (SELECT fortigate FROM device_group_members WHERE device_group = ?)")
+            parameters.append(group)
+
+        if policy_package is not None:
+            conditions.append("name IN (SELECT fortigate FROM policy_package_members WHERE policy_package = ?)")
+            parameters.append(policy_package)
+
+        for field, value in (meta or {}).items():
+            conditions.append("name IN (SELECT fortigate FROM meta_fields WHERE field = ? AND value = ?)")
+            parameters.extend((field, value))
+
+        if connected is not None:
+            conditions.append("conn_status = 1" if connected else "conn_status != 1")
+
+        return self._select("fortigates", conditions, parameters)
+
+    def fortiaps(self, serial: str = None, fortigate: str = None, profile: str = None, group: str = None):
+        """Returns the FortiAPs that match all the given conditions.
+
+        Args:
+            serial (str, optional): Serial number (WTP ID).
+            fortigate (str, optional): Name of the FortiGate managing the FortiAP.
+            profile (str, optional): Name of the FortiAP profile.
+            group (str, optional): Name of a device group the FortiGate managing the FortiAP is a member of.
+
+        Returns:
+            list: JSON data for each FortiAP, as retrieved in the snapshot.
+        """
+
+        conditions, parameters = self._managed(serial=serial, fortigate=fortigate, group=group)
+
+        if profile is not None:
+            conditions.append("profile = ?")
+            parameters.append(profile)
+
+        return self._select("fortiaps", conditions, parameters)
+
+    def fortiswitches(self, serial: str = None, fortigate: str = None, platform: str = None, group: str = None):
+        """Returns the FortiSwitches that match all the given conditions.
+
+        Args:
+            serial (str, optional): Serial number (switch ID).
+            fortigate (str, optional): Name of the FortiGate managing the FortiSwitch.
+            platform (str, optional): Platform. Ex. FS-148F.
+            group (str, optional): Name of a device group the FortiGate managing the FortiSwitch is a member of.
+
+        Returns:
+            list: JSON data for each FortiSwitch, as retrieved in the snapshot.
+        """
+
+        conditions, parameters = self._managed(serial=serial, fortigate=fortigate, group=group)
+
+        if platform is not None:
+            conditions.append("platform = ?")
+            parameters.append(platform)
+
+        return self._select("fortiswitches", conditions, parameters)
+
+    def device_groups(self, fortigate: str = None):
+        """Returns the members of each device group.
+
+        Args:
+            fortigate (str, optional): Only the device groups this FortiGate is a member of.
+
+        Returns:
+            dict: List of {"name", "vdom"} members for each device group, keyed by name.
+        """
+
+        return self._members("device_group_members", "device_group", fortigate)
+
+    def policy_packages(self, fortigate: str = None):
+        """Returns the scope members of each policy package.
+
+        Args:
+            fortigate (str, optional): Only the policy packages this FortiGate is in the scope of.
+
+        Returns:
+            dict: List of {"name", "vdom"} members for each policy package, keyed by name. Packages in folders are named folder/package.
+        """
+
+        return self._members("policy_package_members", "policy_package", fortigate)
+
+    def count(self, by: str = "platform"):
+        """Counts the FortiGates by a column.
+
+        Args:
+            by (str): platform, firmware, os_ver or conn_status. Default is platform.
+
+        Returns:
+            dict: Number of FortiGates for each value.
+        """
+
+        if by not in COUNT_COLUMNS:
+            raise ValueError(f"Cannot count by {by!r}, use one of {', '.join(COUNT_COLUMNS)}")
+
+        return {row[0]: row[1] for row in self._connection.execute(f"SELECT {by}, COUNT(*) FROM fortigates GROUP BY {by} ORDER BY COUNT(*) DESC")}
+
+    def query(self, sql: str, parameters=()):
+        """Runs an SQL query against the inventory, for reports the other methods do not cover.
+
+        Args:
+            sql (str): SQL query. Ex. SELECT platform, firmware, COUNT(*) AS total FROM fortigates GROUP BY 1, 2
+            parameters (tuple | dict): Parameters for the placeholders in the query.
+
+        Returns:
+            list: Each row as a dict.
+        """
+
+        return [dict(row) for row in self._connection.execute(sql, parameters)]
+
+    def _add_fortigate(self, fortigate: dict):
+        name = fortigate.get('name')
+        os_ver, mr, patch = fortigate.get('os_ver'), fortigate.get('mr'), fortigate.get('patch')
+        firmware = f"{os_ver}.{mr}.{patch}" if None not in (os_ver, mr, patch) else None
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO fortigates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (name, fortigate.get('sn'), fortigate.get('ip'), fortigate.get('hostname'), fortigate.get('platform_str'), os_ver, mr, patch, fortigate.get('build'), firmware, fortigate.get('conn_status'), self._json(fortigate))
+        )
+
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO meta_fields VALUES (?, ?, ?)",
+            ((name, field, None if value is None else str(value)) for field, value in (fortigate.get('meta fields') or {}).items())
+        )
+
+    def _managed(self, serial: str = None, fortigate: str = None, group: str = None):
+        """Returns the conditions shared by the FortiAP and FortiSwitch queries.
+        """
+
+        conditions, parameters = [], []
+
+        if serial is not None:
+            conditions.append("sn = ?")
+            parameters.append(serial)
+
+        if fortigate is not None:
+            conditions.append("fortigate = ?")
+            parameters.append(fortigate)
+
+        if group is not None:
+            conditions.append("fortigate IN (SELECT fortigate FROM device_group_members WHERE device_group = ?)")
+            parameters.append(group)
+
+        return conditions, parameters
+
+    def _select(self, table: str, conditions: list, parameters: list):
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        return [json.loads(row[0]) for row in self._connection.execute(f"SELECT data FROM {table}{where} ORDER BY rowid", parameters)]
+
+    def _members(self, table: str, column: str, fortigate: str = None):
+        sql = f"SELECT {column}, fortigate, vdom FROM {table}"
+        parameters = ()
+
+        if fortigate is not None:
+            sql += f" WHERE {column} IN (SELECT {column} FROM {table} WHERE fortigate = ?)"
+            parameters = (fortigate,)
+
+        members = {}
+
+        for name, member, vdom in self._connection.execute(sql + f" ORDER BY {column}, rowid", parameters):
+            members.setdefault(name, []).append({"name": member, "vdom": vdom})
+
+        return members
+
+    @staticmethod
+    def _scope(item: dict):
+        """Returns the name of the FortiGate and VDOM managing a FortiAP or FortiSwitch.
+        """
+
+        scope = item.get('_scope') or [{}]
+        scope = scope[0] if isinstance(scope, list) else scope
+
+        return scope.get('name'), scope.get('vdom')
+
+    @staticmethod
+    def _data(response: dict, url: str):
+        if not response or response.get('status', {}).get('code') != 0:
+            raise FortiManagerError(status=(response or {}).get('status'), url=url)
+
+        return response.get('data') or []
+
+    @classmethod
+    def _packages(cls, entries: list, folder: str = None):
+        """Yields the name and data of each policy package, including those in folders.
+        """
+
+        for entry in entries:
+            name = f"{folder}/{entry.get('name')}" if folder else entry.get('name')
+
+            if entry.get('type') == "folder":
+                yield from cls._packages(entry.get('subobj') or [], folder=name)
+            else:
+                yield name, entry
+
+    @staticmethod
+    def _json(item: dict):
+        return json.dumps(item, separators=(",", ":"))
@@ -0,0 +1,291 @@
+import threading
+import time
+from collections import deque
+
+from pyfortimanager.core.cache import ResponseCache
+
+
+class Budget(object):
+    """Token bucket and maximum number of requests in flight for one kind of call.
+
+    Tokens are reserved ahead of time, so callers queue up in order and the wait time is
+    known before waiting. Slots for requests in flight are handed over to waiting callers
+    in order, whether they wait in a thread or in an event loop.
+
+    Args:
+        rate (float, optional): Requests per second. Defaults to no limit.
+        burst (int, optional): Requests that can be sent at once before rate applies. Defaults to 1, or no limit without a rate.
+        max_in_flight (int, optional): Maximum number of requests sent at the same time. Defaults to no limit.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None, max_in_flight: int = None):
+        self.rate = rate
+        self.burst = burst or 1
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.requests = 0
+        self.wait_last = 0.0
+        self.wait_max = 0.0
+        self.wait_total = 0.0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        """Returns the seconds a request would wait for a token right now.
+        """
+
+        with self._lock:
+            return self._refill(time.monotonic())
+
+    def reserve(self):
+        """Takes a token and returns the seconds to wait before it can be used.
+        """
+
+        if self.rate is None:
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Waits in the calling thread for a token and a slot.
+
+        Returns:
+            float: Seconds waited.
+        """
+
+        start = time.monotonic()
+        delay = self.reserve()
+
+        if delay:
+            time.sleep(delay)
+
+        if self.max_in_flight is not None:
+            with self._lock:
+                granted = self._take()
+
+                if not granted:
+                    event = threading.Event()
+                    self._waiters.append(event)
+
+            if not granted:
+                event.wait()
+
+        return self._waited(start)
+
+    async def acquire_async(self):
+        """Waits in the event loop for a token and a slot.
+
+        Returns:
+            float: Seconds waited.
+        """
+
+        # Imported here, so the sync API does not import asyncio
+        import asyncio
+
+        start = time.monotonic()
+        delay = self.reserve()
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.max_in_flight is not None:
+            with self._lock:
+                granted = self._take()
+
+                if not granted:
+                    future = asyncio.get_running_loop().create_future()
+                    self._waiters.append(future)
+
+            if not granted:
+                try:
+                    await future
+                except asyncio.CancelledError:
+                    with self._lock:
+                        handed_over = future not in self._waiters
+
+                        if not handed_over:
+                            self._waiters.remove(future)
+
+                    # The slot was handed over before the cancellation arrived, pass it on.
+                    # If the future itself was cancelled, _grant passes it on instead.
+                    if handed_over and not future.cancelled():
+                        self.release()
+
+                    raise
+
+        return self._waited(start)
+
+    def release(self):
+        """Frees the slot of a finished request, or hands it over to the next waiting caller.
+        """
+
+        if self.max_in_flight is None:
+            return
+
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+
+                if not waiter.done():
+                    waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+                    return
+
+            self.in_flight -= 1
+
+    def stats(self):
+        """Returns the requests in flight and waiting, and the wait times in seconds.
+        """
+
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "wait_time": self._refill(time.monotonic()),
+                "wait_last": self.wait_last,
+                "wait_max": self.wait_max,
+                "wait_total": self.wait_total
+            }
+
+    def _grant(self, future):
+        # Runs in the loop of the waiting caller. A caller cancelled in the meantime passes the slot on.
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def _take(self):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return True
+
+        return False
+
+    def _refill(self, now: float):
+        if self.rate is None:
+            return 0.0
+
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def _waited(self, start: float):
+        waited = time.monotonic() - start
+
+        with self._lock:
+            self.requests += 1
+            self.wait_last = waited
+            self.wait_max = max(self.wait_max, waited)
+            self.wait_total += waited
+
+        return waited
+
+
+class RateLimiter(object):
+    """Client-side rate limiter for the requests to a FortiManager.
+
+    Requests are sorted into reads (get calls and read-only exec calls), proxy calls to
+    /sys/proxy/json and writes (everything else). Each kind has its own Budget, so e.g.
+    writes can be limited harder than reads. The same limiter works for Api and AsyncApi,
+    and can be shared between them.
+
+    Args:
+        rate (float, optional): Requests per second for each kind without its own budget. Defaults to no limit.
+        burst (int, optional): Requests that can be sent at once for each kind without its own budget.
+        max_in_flight (int, optional): Maximum requests in flight for each kind without its own budget. Defaults to no limit.
+        read (dict, optional): Budget for reads. Ex. {"rate": 20, "burst": 10, "max_in_flight": 8}
+        write (dict, optional): Budget for writes. Ex. {"rate": 2, "max_in_flight": 1}
+        proxy (dict, optional): Budget for proxy calls to FortiGates.
+    """
+
+    KINDS = ("read", "write", "proxy")
+
+    def __init__(self, rate: float = None, burst: int = None, max_in_flight: int = None, read: dict = None, write: dict = None, proxy: dict = None):
+        default = {"rate": rate, "burst": burst, "max_in_flight": max_in_flight}
+
+        self.budgets = {
+            "read": Budget(**(read or default)),
+            "write": Budget(**(write or default)),
+            "proxy": Budget(**(proxy or default))
+        }
+
+    @staticmethod
+    def kind(method: str, params: list):
+        """Returns the kind of a request, i.e. read, write or proxy.
+        """
+
+        urls = ["/" + (payload.get('url') or "").strip("/") for payload in params]
+
+        if any(url.startswith("/sys/proxy/json") for url in urls):
+            return "proxy"
+
+        if method == "get" or (method == "exec" and all(url in ResponseCache.READ_ONLY_EXEC for url in urls)):
+            return "read"
+
+        return "write"
+
+    def slot(self, method: str, params: list):
+        """Returns a context manager that waits for a token and a slot, with "with" or "async with".
+        """
+
+        return Slot(self.budgets[self.kind(method, params)])
+
+    def wait_time(self, kind: str = None):
+        """Returns the seconds a request would wait for a token right now.
+
+        Args:
+            kind (str, optional): read, write or proxy. Defaults to the longest wait of all kinds.
+        """
+
+        if kind:
+            return self.budgets[kind].wait_time()
+
+        return max(budget.wait_time() for budget in self.budgets.values())
+
+    def stats(self):
+        """Returns the stats of each budget, keyed by kind.
+        """
+
+        return {kind: budget.stats() for kind, budget in self.budgets.items()}
+
+
+class Slot(object):
+    """Context manager for a single request. Without a budget it does nothing.
+    """
+
+    __slots__ = ("budget", "waited")
+
+    def __init__(self, budget: Budget = None):
+        self.budget = budget
+        self.waited = 0.0
+
+    def __enter__(self):
+        if self.budget is not None:
+            self.waited = self.budget.acquire()
+
+        return self
+
+    def __exit__(self, *exc):
+        if self.budget is not None:
+            self.budget.release()
+
+    async def __aenter__(self):
+        if self.budget is not None:
+            self.waited = await self.budget.acquire_async()
+
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.budget is not None:
+            self.budget.release()
@@ -0,0 +1,177 @@
+import re
+import threading
+
+
+# Segments followed by a name or ID, replaced by a placeholder in URL templates.
+TEMPLATE_RULES = (
+    (re.compile(r"^/pm/(pkg|wanprof)/adom/[^/]+/[^/]+"), r"/pm/\1/adom/{adom}/{name}"),
+    (re.compile(r"/dynamic_mapping/[^/]+/[^/]+"), "/dynamic_mapping/{device}/{vdom}"),
+    (re.compile(r"/(adom|device|group|pkg|vdom|variable|template-group|managed-switch|wtp|policy|radius)/(?!\{|adom(?:/|$))[^/]+"), lambda match: f"/{match.group(1)}/{{{match.group(1).replace('-', '_')}}}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+)
+
+
+def url_template(url: str):
+    """Returns the URL with names and IDs replaced by placeholders.
+
+    Ex. /dvmdb/adom/root/device/FGT-1 becomes /dvmdb/adom/{adom}/device/{device}
+    """
+
+    url = "/" + (url or "").strip("/")
+
+    for pattern, replacement in TEMPLATE_RULES:
+        url = pattern.sub(replacement, url)
+
+    return url
+
+
+class RequestInfo(object):
+    """A request to the FortiManager API, passed to the before and after hooks.
+
+    Attributes:
+        method (str): get, exec, add, set, update, delete.
+        url (str): URL of the first payload.
+        urls (list): URLs of all payloads.
+        payload_bytes (int): Size of the request body.
+        response_bytes (int): Size of the response body.
+        http_status (int): HTTP status of the last attempt. None if there was no response.
+        code (int): FortiManager status code. The first code that is not 0 for requests with many payloads. None if there was no response.
+        elapsed (float): Wall time in seconds, including retries. None in the before hook.
+        attempts (int): Number of attempts made.
+    """
+
+    __slots__ = ("method", "url", "urls", "payload_bytes", "response_bytes", "http_status", "code", "elapsed", "attempts")
+
+    def __init__(self, method: str, params: list, payload_bytes: int = 0):
+        self.method = method
+        self.urls = [payload.get('url') for payload in params]
+        self.url = self.urls[0] if self.urls else None
+        self.payload_bytes = payload_bytes
+        self.response_bytes = 0
+        self.http_status = None
+        self.code = None
+        self.elapsed = None
+        self.attempts = 0
+
+    def __repr__(self):
+        return f"RequestInfo(method={self.method!r}, url={self.url!r}, http_status={self.http_status!r}, code={self.code!r}, elapsed={self.elapsed!r})"
+
+    def set_results(self, results: list):
+        """Sets the FortiManager status code from the results.
+        """
+
+        codes = [((result or {}).get('status') or {}).get('code', -1) for result in results or []]
+        self.code = next((code for code in codes if code != 0), 0 if codes else None)
+
+
+class Metrics(object):
+    """Hook that keeps latency histograms and byte counts per method and URL template.
+
+    Pass it in the hooks of the API, and export the metrics with prometheus().
+
+    Args:
+        buckets (tuple, optional): Upper bounds of the latency buckets in seconds. Defaults to BUCKETS.
+        namespace (str): Prefix of the metric names. Default is pyfortimanager.
+    """
+
+    BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self, buckets: tuple = None, namespace: str = "pyfortimanager"):
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+        self.namespace = namespace
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def after(self, request: RequestInfo):
+        """Records a finished request.
+        """
+
+        key = (request.method, url_template(request.url))
+        failed = request.http_status != 200 or request.code != 0
+
+        with self._lock:
+            series = self._series.get(key)
+
+            if series is None:
+                series = self._series[key] = {
+                    "buckets": [0] * len(self.buckets),
+                    "count": 0,
+                    "sum": 0.0,
+                    "errors": 0,
+                    "payload_bytes": 0,
+                    "response_bytes": 0
+                }
+
+            for index, bound in enumerate(self.buckets):
+                if request.elapsed <= bound:
+                    series['buckets'][index] += 1
+                    break
+
+            series['count'] += 1
+            series['sum'] += request.elapsed
+            series['errors'] += failed
+            series['payload_bytes'] += request.payload_bytes
+            series['response_bytes'] += request.response_bytes
+
+    def stats(self):
+        """Returns the metrics per method and URL template, with cumulative bucket counts keyed by upper bound.
+        """
+
+        with self._lock:
+            series = {key: dict(value, buckets=list(value['buckets'])) for key, value in self._series.items()}
+
+        for value in series.values():
+            counts, total = {}, 0
+
+            for bound, count in zip(self.buckets, value['buckets']):
+                total += count
+                counts[bound] = total
+
+            value['buckets'] = counts
+
+        return series
+
+    def reset(self):
+        """Drops all recorded metrics.
+        """
+
+        with self._lock:
+            self._series.clear()
+
+    def prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format.
+        """
+
+        name = self.namespace
+        series = sorted(self.stats().items())
+        lines = [
+            f"# HELP {name}_request_duration_seconds Wall time of FortiManager API requests, including retries.",
+            f"# TYPE {name}_request_duration_seconds histogram"
+        ]
+
+        for (method, url), value in series:
+            labels = f'method="{self._escape(method)}",url="{self._escape(url)}"'
+
+            for bound, count in value['buckets'].items():
+                lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+
+            lines.append(f'{name}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {value["count"]}')
+            lines.append(f"{name}_request_duration_seconds_sum{{{labels}}} {value['sum']}")
+            lines.append(f"{name}_request_duration_seconds_count{{{labels}}} {value['count']}")
+
+        for metric, key, description in (
+            ("request_errors_total", "errors", "FortiManager API requests that failed or returned an error status."),
+            ("request_payload_bytes_total", "payload_bytes", "Bytes sent in FortiManager API requests."),
+            ("request_response_bytes_total", "response_bytes", "Bytes received in FortiManager API responses.")
+        ):
+            lines.append(f"# HELP {name}_{metric} {description}")
+            lines.append(f"# TYPE {name}_{metric} counter")
+
+            for (method, url), value in series:
+                lines.append(f'{name}_{metric}{{method="{self._escape(method)}",url="{self._escape(url)}"}} {value[key]}')
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _escape(value: str):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
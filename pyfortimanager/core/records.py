@@ -0,0 +1,169 @@
+import json
+
+
+# Value of a field that was not in the data from FortiManager.
+_MISSING = object()
+
+
+class Record(object):
+    """Compact record for a device returned by FortiManager.
+
+    The commonly used fields are stored as attributes in __slots__. All other fields are kept
+    as compact JSON and only decoded when accessed through extra, get() or [].
+
+    Fields FortiManager did not return, e.g. when fields was passed, read as None through their
+    attribute, but are left out of [], get(), in and to_dict().
+
+    Subclasses set FIELDS to a tuple of (attribute, key) pairs and __slots__ to the attributes.
+    """
+
+    __slots__ = ("_extra",)
+
+    FIELDS = ()
+
+    def __init__(self, data: dict):
+        data = dict(data)
+
+        for attribute, key in self.FIELDS:
+            if key in data:
+                setattr(self, attribute, data.pop(key))
+
+        self._extra = json.dumps(data, separators=(",", ":")).encode() if data else None
+
+    def __getattr__(self, name: str):
+        # Only called for slots that were never set, i.e. fields FortiManager did not return
+        if any(attribute == name for attribute, key in self.FIELDS):
+            return None
+
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __reduce__(self):
+        # Copy and pickle through the data, so fields that were not returned stay missing
+        return type(self), (self.to_dict(),)
+
+    def __repr__(self):
+        attributes = ", ".join(f"{attribute}={getattr(self, attribute)!r}" for attribute, key in self.FIELDS[:3])
+        return f"{type(self).__name__}({attributes})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __getitem__(self, key: str):
+        for attribute, field in self.FIELDS:
+            if field == key:
+                value = self._value(attribute)
+
+                if value is _MISSING:
+                    raise KeyError(key)
+
+                return value
+
+        return self.extra[key]
+
+    def __contains__(self, key: str):
+        for attribute, field in self.FIELDS:
+            if field == key:
+                return self._value(attribute) is not _MISSING
+
+        return key in self.extra
+
+    def get(self, key: str, default=None):
+        """Returns a field by its FortiManager key, like dict.get().
+        """
+
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @property
+    def extra(self):
+        """The fields that are not stored as attributes, decoded on every access.
+        """
+
+        return json.loads(self._extra) if self._extra else {}
+
+    def to_dict(self):
+        """Returns all fields as a dict with the FortiManager keys.
+        """
+
+        data = {}
+
+        for attribute, key in self.FIELDS:
+            value = self._value(attribute)
+
+            if value is not _MISSING:
+                data[key] = value
+
+        data.update(self.extra)
+
+        return data
+
+    def _value(self, attribute: str):
+        """Returns the value of a field attribute, or _MISSING if FortiManager did not return it.
+        """
+
+        try:
+            return object.__getattribute__(self, attribute)
+        except AttributeError:
+            return _MISSING
+
+
+class Device(Record):
+    """A FortiGate from fortigates.all().
+    """
+
+    FIELDS = (
+        ("name", "name"),
+        ("sn", "sn"),
+        ("ip", "ip"),
+        ("conn_status", "conn_status"),
+        ("os_ver", "os_ver"),
+        ("mr", "mr"),
+        ("patch", "patch"),
+        ("build", "build"),
+        ("platform_str", "platform_str"),
+        ("hostname", "hostname"),
+        ("desc", "desc"),
+        ("oid", "oid"),
+        ("mgmt_mode", "mgmt_mode"),
+        ("meta_fields", "meta fields"),
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+
+class ManagedAP(Record):
+    """A FortiAP from fortiaps.all().
+    """
+
+    FIELDS = (
+        ("name", "name"),
+        ("wtp_id", "wtp-id"),
+        ("wtp_profile", "wtp-profile"),
+        ("conn_state", "_conn-state"),
+        ("admin", "admin"),
+        ("location", "location"),
+        ("prefer_img_ver", "_prefer-img-ver"),
+        ("scope", "_scope"),
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+
+class ManagedSwitch(Record):
+    """A FortiSwitch from fortiswitches.all().
+    """
+
+    FIELDS = (
+        ("name", "name"),
+        ("switch_id", "switch-id"),
+        ("description", "description"),
+        ("platform", "_platform"),
+        ("conn_state", "_conn-state"),
+        ("fsw_wan1_peer", "fsw-wan1-peer"),
+        ("prefer_img_ver", "_prefer-img-ver"),
+        ("scope", "_scope"),
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
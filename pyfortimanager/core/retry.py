@@ -0,0 +1,152 @@
+import random
+import threading
+import time
+
+from pyfortimanager.core.cache import ResponseCache
+
+
+class RetryPolicy(object):
+    """Retries failed requests with jittered exponential backoff.
+
+    Only idempotent requests are retried: get calls, read-only exec calls, proxy calls with the
+    get action, and exec calls to the URLs in idempotent_exec. A request is retried when the
+    connection fails or FortiManager answers with one of the HTTP statuses in statuses.
+
+    Args:
+        retries (int): Maximum number of retries per request. 0 disables retries. Default is 3.
+        backoff (float): Seconds to wait before the first retry. Doubled for every retry. Default is 0.5.
+        max_backoff (float): Maximum seconds to wait between retries. Default is 30.
+        statuses (tuple): HTTP statuses to retry. Default is 429, 500, 502, 503 and 504.
+        idempotent_exec (tuple, optional): URLs of exec calls that are safe to retry. Ex. ("/sys/status",)
+    """
+
+    def __init__(self, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30, statuses: tuple = (429, 500, 502, 503, 504), idempotent_exec: tuple = ()):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = tuple(statuses)
+        self.idempotent_exec = tuple(ResponseCache.READ_ONLY_EXEC) + tuple("/" + url.strip("/") for url in idempotent_exec)
+
+    def idempotent(self, method: str, params: list):
+        """Returns True if the request can be sent again without side effects.
+        """
+
+        if method == "get":
+            return True
+
+        if method != "exec":
+            return False
+
+        for payload in params:
+            url = "/" + (payload.get('url') or "").strip("/")
+
+            if url == "/sys/proxy/json":
+                if (payload.get('data') or {}).get('action') != "get":
+                    return False
+            elif url not in self.idempotent_exec:
+                return False
+
+        return True
+
+    def retries_for(self, method: str, params: list):
+        """Returns the number of retries allowed for a request.
+        """
+
+        return self.retries if self.idempotent(method, params) else 0
+
+    def delay(self, retry: int, retry_after: str = None):
+        """Returns the seconds to wait before a retry. A Retry-After header in seconds takes precedence.
+
+        Args:
+            retry (int): Number of the retry, starting at 1.
+            retry_after (str, optional): Retry-After header of the failed response.
+        """
+
+        try:
+            return min(self.max_backoff, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+
+        # Equal jitter, so retries from parallel callers are spread out but still back off.
+        delay = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+
+        return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker(object):
+    """Fails requests fast while the FortiManager is down.
+
+    After failures consecutive failed requests, i.e. connection errors or HTTP 5xx responses,
+    the circuit opens and requests fail without being sent. After reset_timeout seconds a single
+    request is let through. The circuit closes again if it succeeds, and opens again if not.
+
+    Args:
+        failures (int): Consecutive failed requests that open the circuit. Default is 5.
+        reset_timeout (float): Seconds to fail fast before trying again. Default is 30.
+    """
+
+    def __init__(self, failures: int = 5, reset_timeout: float = 30):
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._count = 0
+        self._opened = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """closed, open or half-open.
+        """
+
+        with self._lock:
+            if self._opened is None:
+                return "closed"
+
+            if self._trial or time.monotonic() >= self._opened + self.reset_timeout:
+                return "half-open"
+
+            return "open"
+
+    def allow(self):
+        """Returns True if a request may be sent.
+        """
+
+        with self._lock:
+            if self._opened is None:
+                return True
+
+            if self._trial or time.monotonic() < self._opened + self.reset_timeout:
+                return False
+
+            self._trial = True
+
+            return True
+
+    def success(self):
+        """Records a request that reached the FortiManager.
+        """
+
+        with self._lock:
+            self._count = 0
+            self._opened = None
+            self._trial = False
+
+    def release(self):
+        """Ends a request let through by allow() that neither reached nor failed to reach the FortiManager, e.g. because it was cancelled.
+
+        If it was the trial request, the next request becomes the trial instead.
+        """
+
+        with self._lock:
+            self._trial = False
+
+    def failure(self):
+        """Records a request that failed because the FortiManager could not be reached.
+        """
+
+        with self._lock:
+            self._count += 1
+
+            if self._trial or self._count >= self.failures:
+                self._opened = time.monotonic()
+                self._trial = False
@@ -0,0 +1,885 @@
+"""Local FortiManager JSON-RPC simulator for tests, benchmarks and load tests.
+
+    python -m pyfortimanager.core.simulator --devices 20000 --port 8080 --latency 0.02
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyfortimanager.core.metrics import url_template
+
+
+OK = {"code": 0, "message": "OK"}
+NOT_FOUND = {"code": -3, "message": "Object does not exist"}
+EXISTS = {"code": -2, "message": "Object already exists"}
+INTERNAL_ERROR = {"code": -10, "message": "Internal error"}
+NO_PERMISSION = {"code": -11, "message": "No permission for the resource"}
+
+PLATFORMS = ("FortiGate-40F", "FortiGate-60F", "FortiGate-100F", "FortiGate-VM64")
+FIRMWARE = ((7, 0, 12, 523), (7, 2, 5, 1517), (7, 4, 1, 2463))
+
+# Fields that identify an entry in a table, in order of preference.
+KEY_FIELDS = ("policyid", "wtp-id", "switch-id", "name", "id")
+
+
+class Simulator(object):
+    """FortiManager stand-in that serves /jsonrpc with a synthetic fleet of FortiGates.
+
+    Implements the URL families used by the models: /dvmdb/adom, /pm/config/adom, /pm/pkg/adom,
+    /pm/wanprof/adom, /sys/proxy/json, /task/task, /securityconsole/install and /dvm/cmd. Other
+    tables under /pm and /dvmdb are kept in a generic store, so objects that are added can be
+    retrieved, updated and deleted again.
+
+    The FortiGates, and their FortiAPs and FortiSwitches, are generated from their index when
+    needed, so a fleet of tens of thousands of devices takes little memory. Only changed devices
+    are stored.
+
+    Args:
+        devices (int): Number of FortiGates in the fleet. Default is 1000.
+        adom (str): Name of the ADOM with the fleet. Default is root.
+        aps_per_device (int): FortiAPs per FortiGate. Default is 0.
+        switches_per_device (int): FortiSwitches per FortiGate. Default is 0.
+        policies (int): Firewall policies in the default policy package. Default is 100.
+        offline_rate (float): Share of FortiGates that are offline and fail proxy calls. Default is 0.
+        latency (float): Seconds to wait before answering each request. Default is 0.
+        jitter (float): Maximum random seconds added to the latency. Default is 0.
+        error_rate (float): Share of requests answered with HTTP 503. Default is 0.
+        rpc_error_rate (float): Share of payloads answered with an internal error status. Default is 0.
+        rate_limit (float, optional): Requests per second before answering with HTTP 429. Defaults to no limit.
+        max_concurrent (int, optional): Requests handled at the same time before answering with HTTP 429. Defaults to no limit.
+        task_duration (float): Seconds a task runs before it is done. Default is 1.
+        token (str, optional): Only accept this API token. Defaults to any token.
+        seed (int): Seed for the injected errors and jitter. Default is 0.
+    """
+
+    def __init__(self, devices: int = 1000, adom: str = "root", aps_per_device: int = 0, switches_per_device: int = 0, policies: int = 100,
+                 offline_rate: float = 0, latency: float = 0, jitter: float = 0, error_rate: float = 0, rpc_error_rate: float = 0,
+                 rate_limit: float = None, max_concurrent: int = None, task_duration: float = 1, token: str = None, seed: int = 0):
+        self.devices = devices
+        self.adom = adom
+        self.aps_per_device = aps_per_device
+        self.switches_per_device = switches_per_device
+        self.policies = policies
+        self.offline_rate = offline_rate
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rpc_error_rate = rpc_error_rate
+        self.rate_limit = rate_limit
+        self.max_concurrent = max_concurrent
+        self.task_duration = task_duration
+        self.token = token
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._changed = {}
+        self._deleted = set()
+        self._added = {}
+        self._tables = {}
+        self._tasks = {}
+        self._in_flight = 0
+        self._tokens = float(rate_limit or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.RLock()
+        self._server = None
+        self._seed()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def url(self):
+        """URL to pass as host to the API.
+        """
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0):
+        """Starts serving in a background thread.
+
+        Args:
+            host (str): Address to listen on. Default is 127.0.0.1.
+            port (int): Port to listen on. Defaults to a free port.
+
+        Returns:
+            str: URL to pass as host to the API.
+        """
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="pyfortimanager-simulator", daemon=True).start()
+
+        return self.url
+
+    def stop(self):
+        """Stops serving.
+        """
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8080):
+        """Serves in the calling thread until interrupted.
+        """
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            self._server = None
+
+    def handle(self, method: str, params: dict):
+        """Returns the result of a single JSON-RPC payload.
+        """
+
+        url = "/" + (params.get('url') or "").strip("/")
+        self.requests[(method, url_template(url))] += 1
+
+        if self.rpc_error_rate and self._chance(self.rpc_error_rate):
+            return {"status": INTERNAL_ERROR, "url": url}
+
+        try:
+            status, data = self._route(method, url, params)
+        except (KeyError, TypeError, ValueError, IndexError):
+            status, data = {"code": -6, "message": "Invalid url or data"}, None
+
+        result = {"status": status, "url": url}
+
+        if data is not None:
+            result['data'] = data
+
+        return result
+
+    def device(self, index: int):
+        """Returns the synthetic FortiGate with an index, including changes made through the API.
+        """
+
+        name = self._name(index)
+
+        if name in self._changed:
+            return self._changed[name]
+
+        major, minor, patch, build = FIRMWARE[index % len(FIRMWARE)]
+
+        return {
+            "name": name,
+            "hostname": name,
+            "sn": f"FGT{index % len(PLATFORMS)}0FTK{index:08d}",
+            "ip": f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}",
+            "conn_status": 2 if self._offline(index) else 1,
+            "conf_status": 1,
+            "db_status": 1,
+            "dev_status": 1,
+            "os_type": 0,
+            "os_ver": major,
+            "mr": minor,
+            "patch": patch,
+            "build": build,
+            "platform_str": PLATFORMS[index % len(PLATFORMS)],
+            "desc": f"Simulated FortiGate {index}",
+            "oid": 10000 + index,
+            "mgmt_mode": 3,
+            "ha_mode": 0,
+            "vdom": [{"name": "root", "oid": 3, "opmode": 1}],
+            "meta fields": {"site_id": str(index), "region": f"region-{index % 10}"},
+            "latitude": "55.676098",
+            "longitude": "12.568337"
+        }
+
+    # Routing
+
+    def _route(self, method: str, url: str, params: dict):
+        parts = url.strip("/").split("/")
+
+        if url == "/sys/status":
+            return OK, {"Hostname": "simulator", "Version": "v7.4.2-build2397 231209 (GA)", "Serial Number": "FMG-VM0000000001", "Platform Type": "FMG-VM64"}
+
+        if url == "/sys/proxy/json":
+            return OK, self._proxy(params['data'])
+
+        if parts[0] == "task":
+            return self._task(method, parts, params)
+
+        if parts[0] == "securityconsole" and parts[1] == "install":
+            scope = params['data'].get('scope') or []
+            return OK, {"task": self._start_task(title=f"Install {parts[2]}", names=[member['name'] for member in scope])}
+
+        if parts[0] == "dvm" and parts[1] == "cmd":
+            return self._dvm(parts, params)
+
+        if parts[:2] == ["um", "image"] and parts[-1] in ("upgrade", "ext"):
+            devices = (params.get('data') or {}).get('device') or []
+            return OK, {"taskid": self._start_task(title="Upgrade", names=[device.get('name') for device in devices])}
+
+        if parts[0] == "dvmdb" and len(parts) >= 2 and parts[1] == "adom":
+            return self._dvmdb(method, parts, params)
+
+        if url == "/um/image/version/list":
+            return OK, []
+
+        return self._store(method, url, params)
+
+    def _dvmdb(self, method: str, parts: list, params: dict):
+        if len(parts) == 2:
+            adoms = [{"name": self.adom, "oid": 3, "state": 1, "os_ver": 7, "mr": 4}]
+            return (OK, adoms) if method == "get" else (NO_PERMISSION, None)
+
+        if len(parts) == 3:
+            return (OK, {"name": self.adom, "oid": 3}) if parts[2] == self.adom else (NOT_FOUND, None)
+
+        if len(parts) >= 4 and parts[3] == "workspace":
+            return OK, None
+
+        if parts[3] == "script" and len(parts) == 5 and parts[4] == "execute":
+            scope = (params.get('data') or {}).get('scope') or []
+            return OK, {"task": self._start_task(title="Run script", names=[member['name'] for member in scope])}
+
+        if parts[3] == "device":
+            if len(parts) == 4 and method == "get":
+                # Pages start at their offset, so paging through a large fleet stays linear
+                if params.get('range') and not params.get('filter'):
+                    offset, limit = params['range']
+                    return OK, self._query(self._fleet(offset), dict(params, range=[0, limit]))
+
+                return OK, self._query(self._fleet(), params)
+
+            if len(parts) == 5:
+                return self._device_object(method, parts[4], params)
+
+        return self._store(method, "/" + "/".join(parts), params)
+
+    def _device_object(self, method: str, name: str, params: dict):
+        with self._lock:
+            device = self._find(name)
+
+            if device is None:
+                return NOT_FOUND, None
+
+            if method == "get":
+                return OK, self._project(device, params.get('fields'))
+
+            if method in ("update", "set"):
+                device = dict(copy.deepcopy(device), **params.get('data') or {})
+                self._changed[name] = device
+
+                if name in self._added:
+                    self._added[name] = device
+
+                return OK, {"name": name}
+
+            if method == "delete":
+                self._remove(name)
+                return OK, None
+
+        return NO_PERMISSION, None
+
+    def _dvm(self, parts: list, params: dict):
+        data = params.get('data') or {}
+        action = "/".join(parts[2:])
+
+        if action == "add/device":
+            device = self._added_device(data['device'])
+            return OK, {"device": device}
+
+        if action == "add/dev-list":
+            names = [self._added_device(device)['name'] for device in data.get('add-dev-list') or []]
+            return OK, {"taskid": self._start_task(title="Add devices", names=names)}
+
+        if action == "del/device":
+            with self._lock:
+                if self._find(data.get('device')) is None:
+                    return NOT_FOUND, None
+
+                self._remove(data['device'])
+
+            return OK, None
+
+        if action == "update/dev-list":
+            names = [device.get('name') for device in data.get('update-dev-member-list') or []]
+            return OK, {"taskid": self._start_task(title="Update devices", names=names)}
+
+        return OK, None
+
+    def _task(self, method: str, parts: list, params: dict):
+        if method != "get":
+            return NO_PERMISSION, None
+
+        with self._lock:
+            if len(parts) >= 3:
+                task = self._tasks.get(int(parts[2]))
+                return (OK, self._task_state(task, lines=True)) if task else (NOT_FOUND, None)
+
+            tasks = [self._task_state(task, lines=params.get('loadsub', False)) for task in self._tasks.values()]
+
+        return OK, self._query(tasks, params)
+
+    def _proxy(self, data: dict):
+        results = []
+
+        for target in data.get('target') or []:
+            name = target.rstrip("/").split("/")[-1]
+            device = self._find(name)
+
+            if device is None:
+                results.append({"status": {"code": -3, "message": "Device not found"}, "target": name})
+                continue
+
+            if device.get('conn_status') != 1:
+                results.append({"status": {"code": -1, "message": "Device is not online"}, "target": name})
+                continue
+
+            response = {
+                "http_method": data.get('action', "get").upper(),
+                "status": "success",
+                "http_status": 200,
+                "vdom": "root",
+                "serial": device['sn'],
+                "version": f"v{device['os_ver']}.{device['mr']}.{device['patch']}",
+                "build": device['build'],
+                "results": {"hostname": device['hostname'], "model_name": "FortiGate", "model": device['platform_str']}
+            }
+
+            results.append({"response": response, "status": OK, "target": name})
+
+        return results
+
+    # Generic store for tables under /pm and /dvmdb
+
+    def _store(self, method: str, url: str, params: dict):
+        with self._lock:
+            table, key = self._locate(url)
+
+            if method == "get":
+                if table is not None and key is None:
+                    return OK, self._query((self._with_members(url, entry_key, entry, params) for entry_key, entry in table.items()), params)
+
+                if table is not None and key in table:
+                    return OK, self._project(self._with_members(url.rpartition("/")[0], key, table[key], params), params.get('fields'))
+
+                # Sub-tables of existing objects, e.g. object member or dynamic_mapping, start out empty
+                parent, key = self._locate(url.rpartition("/")[0])
+
+                if table is None and parent is not None and key in parent:
+                    return OK, []
+
+                return NOT_FOUND, None
+
+            data = params.get('data')
+            parent, _, last = url.rpartition("/")
+
+            # Objects can be added at their own URL, ex. /dvmdb/adom/root/group/{name}
+            if method in ("add", "set") and isinstance(data, dict) and self._key(data) == last:
+                url, table, key = parent, self._tables.get(parent), None
+
+            if key is not None:
+                if table is None or key not in table:
+                    return NOT_FOUND, None
+
+                if method == "delete":
+                    del table[key]
+                    return OK, None
+
+                table[key] = dict(table[key], **data) if method == "update" else dict(data)
+                return OK, self._key_data(table[key])
+
+            table = self._tables.setdefault(url, {})
+            entries = data if isinstance(data, list) else [data] if data else []
+
+            if method == "delete":
+                if not entries:
+                    table.clear()
+
+                for entry in entries:
+                    table.pop(self._key(entry), None)
+
+                return OK, None
+
+            for entry in entries:
+                entry_key = self._key(entry)
+
+                if method == "add" and entry_key in table:
+                    return EXISTS, None
+
+                if method == "update" and entry_key not in table:
+                    return NOT_FOUND, None
+
+                table[entry_key] = dict(table.get(entry_key) or {}, **entry) if method == "update" else dict(entry)
+
+            if len(entries) == 1:
+                return OK, self._key_data(entries[0])
+
+            return OK, None
+
+    def _with_members(self, url: str, key: str, entry: dict, params: dict):
+        """Returns the entry with the scope members of a policy package, or the object members of a device group when asked for.
+        """
+
+        members = {}
+
+        if url.startswith("/pm/pkg/") and f"{url}/{key}/scope member" in self._tables:
+            members['scope member'] = list(self._tables[f"{url}/{key}/scope member"].values())
+
+        if "object member" in (params.get('option') or []) and f"{url}/{key}/object member" in self._tables:
+            members['object member'] = list(self._tables[f"{url}/{key}/object member"].values())
+
+        return dict(entry, **members) if members else entry
+
+    def _locate(self, url: str):
+        """Returns the table of a URL and the key of the entry, or None for the whole table.
+        """
+
+        if url in self._tables:
+            return self._tables[url], None
+
+        # Entries are identified by the last segment, or the last two in dynamic mappings per device and VDOM.
+        parent, _, key = url.rpartition("/")
+
+        if parent in self._tables:
+            return self._tables[parent], key
+
+        parent, _, device = parent.rpartition("/")
+
+        if parent.endswith("/dynamic_mapping") and parent in self._tables:
+            return self._tables[parent], f"{device}/{key}"
+
+        return None, None
+
+    @staticmethod
+    def _key(entry: dict):
+        if entry.get('_scope'):
+            scope = entry['_scope'][0] if isinstance(entry['_scope'], list) else entry['_scope']
+            return f"{scope.get('name')}/{scope.get('vdom')}"
+
+        for field in KEY_FIELDS:
+            if entry.get(field) is not None:
+                if field == "name" and isinstance(entry.get('vdom'), str):
+                    return f"{entry['name']}/{entry['vdom']}"
+
+                return str(entry[field])
+
+        return json.dumps(entry, sort_keys=True)
+
+    @staticmethod
+    def _key_data(entry: dict):
+        for field in KEY_FIELDS:
+            if field in entry:
+                return {field: entry[field]}
+
+        return None
+
+    # Queries
+
+    def _query(self, items, params: dict):
+        """Applies the filter, scope member, range and fields of a get call.
+        """
+
+        scope = params.get('scope member')
+
+        if scope and scope[0].get('name') != "All_FortiGate":
+            names = {member.get('name') for member in scope}
+            items = (item for item in items if any(member.get('name') in names for member in item.get('_scope') or []))
+
+        if params.get('filter'):
+            items = (item for item in items if self._match(item, params['filter']))
+
+        if params.get('range'):
+            offset, limit = params['range']
+            items = itertools.islice(items, offset, offset + limit)
+
+        return [self._project(item, params.get('fields')) for item in items]
+
+    def _match(self, item: dict, condition: list):
+        if condition and isinstance(condition[0], list):
+            # [[...], "&&", [...]] or [[...], "||", [...]]
+            result = self._match(item, condition[0])
+
+            for operator, other in zip(condition[1::2], condition[2::2]):
+                result = (result and self._match(item, other)) if operator == "&&" else (result or self._match(item, other))
+
+            return result
+
+        field, operator, values = condition[0], condition[1], condition[2:]
+        value = item.get(field)
+
+        if operator == "==":
+            return value == values[0]
+
+        if operator == "!=":
+            return value != values[0]
+
+        if operator == "in":
+            return value in values
+
+        if operator == "like":
+            return str(values[0]).strip("%") in str(value)
+
+        return False
+
+    @staticmethod
+    def _project(item: dict, fields: list = None):
+        if not fields:
+            return item
+
+        return {field: item[field] for field in fields if field in item}
+
+    # Fleet
+
+    def _name(self, index: int):
+        return f"FGT-{index:05d}"
+
+    def _index(self, name: str):
+        try:
+            index = int(name[4:]) if name.startswith("FGT-") else -1
+        except ValueError:
+            return None
+
+        return index if 0 <= index < self.devices and self._name(index) == name else None
+
+    def _offline(self, index: int):
+        return (index * 2654435761 % 4294967296) / 4294967296 < self.offline_rate
+
+    def _fleet(self, offset: int = 0):
+        """Yields the FortiGates, skipping the first offset without generating them.
+        """
+
+        for index in range(self.devices):
+            if self._deleted and self._name(index) in self._deleted:
+                continue
+
+            if offset:
+                offset -= 1
+                continue
+
+            yield self.device(index)
+
+        yield from list(self._added.values())[offset:]
+
+    def _find(self, name: str):
+        if name in self._added:
+            return self._added[name]
+
+        index = self._index(name or "")
+
+        if index is None or name in self._deleted:
+            return None
+
+        return self.device(index)
+
+    def _remove(self, name: str):
+        self._added.pop(name, None)
+        self._changed.pop(name, None)
+
+        if self._index(name) is not None:
+            self._deleted.add(name)
+
+    def _added_device(self, device: dict):
+        name = device.get('name') or device.get('sn')
+        added = dict(device, name=name, conn_status=1, oid=20000 + len(self._added), **{"meta fields": device.get('meta fields') or {}})
+
+        with self._lock:
+            self._added[name] = added
+
+        return added
+
+    def _seed(self):
+        """Creates the default device group and policy package, its firewall policies, and the FortiAP and FortiSwitch tables.
+        """
+
+        self._tables[f"/dvmdb/adom/{self.adom}/group"] = {"All_FortiGate": {"name": "All_FortiGate", "desc": "", "os_type": 0, "type": 1}}
+        self._tables[f"/pm/pkg/adom/{self.adom}"] = {"default": {"name": "default", "type": "pkg", "oid": 1000}}
+        self._tables[f"/pm/pkg/adom/{self.adom}/default/scope member"] = {}
+        self._tables[f"/pm/config/adom/{self.adom}/pkg/default/firewall/policy"] = {
+            str(policyid): {"policyid": policyid, "name": f"policy-{policyid}", "status": 1, "action": 1, "srcintf": ["internal"], "dstintf": ["wan1"], "srcaddr": ["all"], "dstaddr": ["all"], "service": ["ALL"], "schedule": ["always"]}
+            for policyid in range(1, self.policies + 1)
+        }
+
+        if self.aps_per_device:
+            self._tables[f"/pm/config/adom/{self.adom}/obj/wireless-controller/wtp"] = _Generated(self, self._ap, self.aps_per_device)
+
+        if self.switches_per_device:
+            self._tables[f"/pm/config/adom/{self.adom}/obj/fsp/managed-switch"] = _Generated(self, self._switch, self.switches_per_device)
+
+    def _ap(self, index: int, number: int):
+        serial = f"FP231F{index:06d}{number:02d}"
+
+        return {
+            "name": serial,
+            "wtp-id": serial,
+            "wtp-profile": "FAP231F-default",
+            # FortiManager reports a connected FortiAP as 2, like fortiaps.check_status expects
+            "_conn-state": 2 if not self._offline(index) else 0,
+            "admin": "enable",
+            "location": f"Store {index}",
+            "_prefer-img-ver": None,
+            "_scope": [{"name": self._name(index), "vdom": "root"}]
+        }
+
+    def _switch(self, index: int, number: int):
+        serial = f"S148FF{index:06d}{number:02d}"
+
+        return {
+            "name": serial,
+            "switch-id": serial,
+            "description": f"Store {index} switch {number}",
+            "_platform": "FS-148F",
+            "_conn-state": 1 if not self._offline(index) else 0,
+            "fsw-wan1-peer": "fortilink",
+            "_prefer-img-ver": None,
+            "_scope": [{"name": self._name(index), "vdom": "root"}]
+        }
+
+    # Tasks
+
+    def _start_task(self, title: str, names: list):
+        with self._lock:
+            task = len(self._tasks) + 1
+            self._tasks[task] = {"id": task, "title": title, "adom": self.adom, "names": [name for name in names if name], "start": time.time()}
+
+        return task
+
+    def _task_state(self, task: dict, lines: bool = False):
+        elapsed = time.time() - task['start']
+        done = elapsed >= self.task_duration
+        percent = 100 if done else int(100 * elapsed / self.task_duration) if self.task_duration else 100
+
+        state = {
+            "id": task['id'],
+            "title": task['title'],
+            "adom": task['adom'],
+            "state": 4 if done else 1,
+            "percent": percent,
+            "num_lines": len(task['names']),
+            "num_done": len(task['names']) if done else 0,
+            "num_err": 0,
+            "start_tm": int(task['start']),
+            "end_tm": int(task['start'] + self.task_duration) if done else 0
+        }
+
+        if lines:
+            state['line'] = [
+                {"name": name, "state": state['state'], "percent": percent, "err": 0, "detail": "OK" if done else "Running"}
+                for name in task['names']
+            ]
+
+        return state
+
+    # Transport
+
+    def _chance(self, rate: float):
+        with self._lock:
+            return self._random.random() < rate
+
+    def _admit(self):
+        """Returns True if a request is within the rate limit and concurrency limit.
+        """
+
+        with self._lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                self._tokens = min(float(self.rate_limit), self._tokens + (now - self._updated) * self.rate_limit)
+                self._updated = now
+
+                if self._tokens < 1:
+                    return False
+
+                self._tokens -= 1
+
+            if self.max_concurrent and self._in_flight >= self.max_concurrent:
+                return False
+
+            self._in_flight += 1
+
+            return True
+
+    def _done(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _handler(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+
+                # Headers and body are written separately, so avoid the Nagle delay on keep-alive connections
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+                if self.path.rstrip("/") != "/jsonrpc":
+                    return self._reply(404, b"")
+
+                if not simulator._admit():
+                    return self._reply(429, b"", {"Retry-After": "1"})
+
+                try:
+                    if simulator.latency or simulator.jitter:
+                        time.sleep(simulator.latency + (simulator._random.uniform(0, simulator.jitter) if simulator.jitter else 0))
+
+                    if simulator.error_rate and simulator._chance(simulator.error_rate):
+                        return self._reply(503, b"")
+
+                    request = json.loads(body)
+                    authorization = self.headers.get("Authorization") or ""
+
+                    if simulator.token is not None and authorization != f"Bearer {simulator.token}":
+                        results = [{"status": NO_PERMISSION, "url": params.get('url')} for params in request.get('params') or []]
+                    else:
+                        results = [simulator.handle(request.get('method'), params) for params in request.get('params') or []]
+
+                    self._reply(200, json.dumps({"id": request.get('id', 1), "result": results}).encode())
+                finally:
+                    simulator._done()
+
+            def _reply(self, status: int, out: bytes, headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+
+                self.end_headers()
+                self.wfile.write(out)
+
+            def log_message(self, *args):
+                pass
+
+        Handler.request_queue_size = 1024
+
+        return Handler
+
+
+class _Generated(dict):
+    """Table of FortiAPs or FortiSwitches generated per FortiGate. Entries are only stored once changed.
+    """
+
+    def __init__(self, simulator: Simulator, factory, per_device: int):
+        super(_Generated, self).__init__()
+        self.simulator = simulator
+        self.factory = factory
+        self.per_device = per_device
+        self.deleted = set()
+
+    def _generated(self):
+        for index in range(self.simulator.devices):
+            for number in range(self.per_device):
+                entry = self.factory(index, number)
+
+                if entry['name'] not in self.deleted and not super(_Generated, self).__contains__(entry['name']):
+                    yield entry['name'], entry
+
+        yield from super(_Generated, self).items()
+
+    def _lookup(self, key: str):
+        try:
+            index, number = int(key[6:12]), int(key[12:14])
+        except ValueError:
+            return None
+
+        if key in self.deleted or not (0 <= index < self.simulator.devices and 0 <= number < self.per_device):
+            return None
+
+        entry = self.factory(index, number)
+
+        return entry if entry['name'] == key else None
+
+    def __contains__(self, key):
+        return super(_Generated, self).__contains__(key) or self._lookup(key) is not None
+
+    def __getitem__(self, key):
+        if super(_Generated, self).__contains__(key):
+            return super(_Generated, self).__getitem__(key)
+
+        entry = self._lookup(key)
+
+        if entry is None:
+            raise KeyError(key)
+
+        return entry
+
+    def __delitem__(self, key):
+        if super(_Generated, self).__contains__(key):
+            super(_Generated, self).__delitem__(key)
+
+        self.deleted.add(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+
+        if default:
+            return default[0]
+
+        raise KeyError(key)
+
+    def items(self):
+        return self._generated()
+
+    def values(self):
+        return [entry for name, entry in self._generated()]
+
+    def clear(self):
+        super(_Generated, self).clear()
+        self.deleted.update(name for name, entry in self._generated())
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Serves a simulated FortiManager JSON-RPC API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--aps-per-device", type=int, default=0)
+    parser.add_argument("--switches-per-device", type=int, default=0)
+    parser.add_argument("--offline-rate", type=float, default=0)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rpc-error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit", type=float)
+    parser.add_argument("--max-concurrent", type=int)
+    parser.add_argument("--task-duration", type=float, default=1)
+    args = parser.parse_args(argv)
+
+    simulator = Simulator(
+        devices=args.devices, aps_per_device=args.aps_per_device, switches_per_device=args.switches_per_device, offline_rate=args.offline_rate,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, rpc_error_rate=args.rpc_error_rate, rate_limit=args.rate_limit,
+        max_concurrent=args.max_concurrent, task_duration=args.task_duration
+    )
+
+    print(f"Simulating a FortiManager with {args.devices} FortiGates on http://{args.host}:{args.port}/jsonrpc")
+
+    try:
+        simulator.serve_forever(host=args.host, port=args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import codecs
+import json
+import re
+
+from pyfortimanager.core.exceptions import FortiManagerError
+
+
+WHITESPACE = " \t\r\n"
+
+# Characters that matter while scanning an item: in a string, nested in an item, and at the top level of an item.
+STRING = re.compile(r'["\\]')
+NESTED = re.compile(r'["{}\[\]]')
+TOP = re.compile(r'["{}\[\],\s]')
+
+
+class DataDecoder(object):
+    """Incremental decoder for the data array of the first result in a JSON-RPC response.
+
+    Feed it the response body chunk by chunk. Each item in result[0].data is decoded and
+    returned as soon as it is complete, so neither the body nor the full object tree is
+    held in memory. The rest of the response is only checked for an error status on close().
+
+    Args:
+        url (str, optional): URL of the call, used in errors.
+    """
+
+    def __init__(self, url: str = None):
+        self.url = url
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._phase = "header"
+
+        # Header state
+        self._stack = []
+        self._keys = {}
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string = None
+        self._result_index = 0
+        self._found_data = False
+        self._prefix = None
+
+        # Item state
+        self._depth = 0
+        self._scan = 0
+
+    def feed(self, chunk: bytes):
+        """Adds a chunk of the body.
+
+        Returns:
+            list: Items completed by this chunk.
+        """
+
+        # Drop the items decoded so far, so the buffer is only copied once per chunk
+        if self._phase == "items" and self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._scan -= self._pos
+            self._pos = 0
+
+        self._buffer += self._utf8.decode(chunk)
+
+        return self._run()
+
+    def close(self):
+        """Ends the body and checks the status of the response.
+
+        Raises:
+            FortiManagerError: FortiManager returned an error status, or the body was incomplete.
+
+        Returns:
+            list: Items that are only known at the end, i.e. when data is a single object.
+        """
+
+        self._buffer += self._utf8.decode(b"", final=True)
+        items = self._run()
+
+        if self._phase in ("header", "body"):
+            # There was no data array, so the whole (small) body is still buffered.
+            result = self._result(self._buffer)
+            data = result.get('data')
+
+            if isinstance(data, list):
+                items.extend(data)
+            elif data is not None:
+                items.append(data)
+
+            return items
+
+        if self._phase != "suffix":
+            raise FortiManagerError(status={"code": -1, "message": "Incomplete response from the FortiManager"}, url=self.url)
+
+        self._result(self._prefix + "[]" + self._buffer)
+
+        return items
+
+    def _result(self, body: str):
+        try:
+            result = json.loads(body)['result'][0]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise FortiManagerError(status={"code": -1, "message": "Invalid response from the FortiManager"}, url=self.url)
+
+        if result.get('status', {}).get('code') != 0:
+            raise FortiManagerError(status=result.get('status'), url=self.url)
+
+        return result
+
+    def _run(self):
+        items = []
+
+        if self._phase == "header":
+            self._header()
+
+        while self._phase == "items":
+            item = self._item()
+
+            if item is None:
+                break
+
+            items.append(item[0])
+
+        return items
+
+    def _header(self):
+        """Scans for the start of the data array of result[0]. The text before it is kept as the prefix.
+        """
+
+        buffer = self._buffer
+
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+
+            if self._found_data:
+                if char in WHITESPACE:
+                    self._pos += 1
+                    continue
+
+                if char != "[":
+                    # Not an array, the whole body is decoded on close().
+                    self._phase = "body"
+                    return
+
+                self._prefix = buffer[:self._pos]
+                self._buffer = buffer[self._pos + 1:]
+                self._pos = 0
+                self._phase = "items"
+                return
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buffer[self._string_start:self._pos]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._pos + 1
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+            elif char == ",":
+                if len(self._stack) == 2:
+                    self._result_index += 1
+            elif char == ":":
+                depth = len(self._stack) - 1
+                self._keys[depth] = self._last_string
+
+                if self._stack == ["{", "[", "{"] and self._keys.get(0) == "result" and self._result_index == 0 and self._last_string == "data":
+                    self._found_data = True
+
+            self._pos += 1
+
+    def _item(self):
+        """Decodes the next item of the data array.
+
+        Returns:
+            tuple: The item, or None if more of the body is needed.
+        """
+
+        buffer = self._buffer
+
+        # Skip to the start of the next item
+        if self._depth == 0 and not self._in_string and self._scan == self._pos:
+            while self._pos < len(buffer) and buffer[self._pos] in WHITESPACE + ",":
+                self._pos += 1
+
+            if self._pos >= len(buffer):
+                self._buffer = ""
+                self._pos = 0
+                self._scan = 0
+                return None
+
+            if buffer[self._pos] == "]":
+                self._buffer = buffer[self._pos + 1:]
+                self._pos = 0
+                self._phase = "suffix"
+                return None
+
+            self._scan = self._pos
+
+        # Find the end of the item, jumping between the characters that matter
+        index = self._scan
+
+        while True:
+            if self._in_string:
+                if self._escape:
+                    if index >= len(buffer):
+                        break
+
+                    index += 1
+                    self._escape = False
+
+                match = STRING.search(buffer, index)
+
+                if match is None:
+                    index = len(buffer)
+                    break
+
+                index = match.end()
+
+                if match.group() == "\\":
+                    self._escape = True
+                    continue
+
+                self._in_string = False
+
+                if self._depth == 0:
+                    return self._complete(index)
+
+                continue
+
+            match = (NESTED if self._depth else TOP).search(buffer, index)
+
+            if match is None:
+                index = len(buffer)
+                break
+
+            char = match.group()
+            index = match.end()
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    return self._complete(index - 1)
+
+                self._depth -= 1
+
+                if self._depth == 0:
+                    return self._complete(index)
+            else:
+                # Whitespace or a comma ends a number, true, false or null
+                return self._complete(index - 1)
+
+        self._scan = index
+
+        return None
+
+    def _complete(self, end: int):
+        item = json.loads(self._buffer[self._pos:end])
+
+        self._pos = end
+        self._scan = end
+
+        return (item,)
@@ -0,0 +1,275 @@
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.fortimanager import FortiManager
+
+
+# Task states, as numbers or as strings when FortiManager returns them verbose.
+FINISHED_STATES = (3, 4, 5, 7, 8, "cancelled", "done", "error", "aborted", "warning")
+
+
+def task_id(response: dict):
+    """Returns the task ID from the response of a call that creates a task, or None.
+
+    Args:
+        response (dict): JSON data from e.g. install_wizard.policy_package or fortigates.refresh.
+
+    Returns:
+        int: ID of the task.
+    """
+
+    data = (response or {}).get('data')
+
+    if isinstance(data, dict):
+        for key in ("task", "taskid", "tid"):
+            if data.get(key) is not None:
+                return int(data[key])
+
+    return None
+
+
+def finished(task: dict):
+    """Returns True if the task has finished, successfully or not.
+    """
+
+    return task.get('state') in FINISHED_STATES or task.get('percent') == 100
+
+
+class TaskWaiter(object):
+    """Follows many FortiManager tasks at once.
+
+    All watched tasks are polled with a single filtered /task/task query per cycle, in a background
+    thread. The poll interval starts at interval and grows by backoff up to max_interval while no
+    task makes progress, and drops back to interval when one does.
+
+    A task FortiManager does not return in a successful poll does not exist, and its future fails with
+    FortiManagerError. When max_errors polls in a row fail, every pending future fails with the error.
+
+    Args:
+        api (Api): The API to poll with.
+        interval (float): Seconds between polls while tasks make progress. Default is 1.
+        max_interval (float): Maximum seconds between polls. Default is 30.
+        backoff (float): Factor to grow the interval by when no task made progress. Default is 1.5.
+        max_errors (int): Number of failed polls in a row before the pending tasks fail. Default is 3.
+    """
+
+    def __init__(self, api, interval: float = 1, max_interval: float = 30, backoff: float = 1.5, max_errors: int = 3):
+        self.api = api
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_errors = max_errors
+        self.polls = 0
+        self._pending = {}
+        self._progress = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def watch(self, task, callback=None):
+        """Starts following a task.
+
+        Args:
+            task (int | str | dict): ID of the task, or the response of the call that created it.
+            callback (callable, optional): Called with the task when it finishes, from the polling thread.
+
+        Returns:
+            Future: Resolves to the task, including its lines, when it finishes.
+        """
+
+        task = self._id(task)
+
+        with self._lock:
+            future = self._pending.get(task)
+
+            if future is None:
+                future = self._pending[task] = Future()
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pyfortimanager-tasks", daemon=True)
+                self._thread.start()
+
+        if callback:
+            future.add_done_callback(lambda done: done.cancelled() or done.exception() or callback(done.result()))
+
+        self._wakeup.set()
+
+        return future
+
+    def wait(self, tasks: list, timeout: float = None, return_exceptions: bool = False):
+        """Follows a list of tasks and waits for them to finish.
+
+        Args:
+            tasks (list): IDs of the tasks, or the responses of the calls that created them.
+            timeout (float, optional): Maximum seconds to wait. Defaults to no limit.
+            return_exceptions (bool): Return the error of a task that failed in its place, instead of raising it. Default is False.
+
+        Returns:
+            dict: The task for each ID, or None if it did not finish before the timeout.
+
+        Raises:
+            FortiManagerError: If a task does not exist, or polling kept failing, and return_exceptions is False.
+        """
+
+        futures = self._watch_all(tasks)
+        wait_futures(list(futures.values()), timeout=timeout)
+
+        return self._results(futures, return_exceptions=return_exceptions)
+
+    def poll(self):
+        """Polls all pending tasks once and resolves the finished ones.
+
+        Returns:
+            bool: True if any task finished or made progress.
+
+        Raises:
+            FortiManagerError: If FortiManager returned an error status for the poll.
+        """
+
+        with self._lock:
+            ids = list(self._pending)
+
+        if not ids:
+            return False
+
+        self.polls += 1
+
+        params = {
+            "url": "/task/task",
+            "filter": ["id", "in", *ids],
+            "loadsub": True
+        }
+
+        response = self._get(params=params)
+        status = (response or {}).get('status') or {"code": -1, "message": "No response from the FortiManager"}
+
+        if status.get('code') != 0:
+            raise FortiManagerError(status=status, url=params['url'])
+
+        progress = False
+        missing = set(ids)
+
+        for task in response.get('data') or []:
+            tid = task.get('id')
+            missing.discard(tid)
+            percent = task.get('percent')
+
+            if self._progress.get(tid) != percent:
+                self._progress[tid] = percent
+                progress = True
+
+            if finished(task):
+                with self._lock:
+                    future = self._pending.pop(tid, None)
+
+                self._progress.pop(tid, None)
+
+                if future is not None and future.set_running_or_notify_cancel():
+                    future.set_result(task)
+
+        for tid in missing:
+            with self._lock:
+                future = self._pending.pop(tid, None)
+
+            self._progress.pop(tid, None)
+
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_exception(FortiManagerError(status={"code": -3, "message": f"Task {tid} does not exist"}, url=params['url']))
+                progress = True
+
+        return progress
+
+    def close(self):
+        """Stops polling. Tasks that have not finished are cancelled.
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for future in pending.values():
+            future.cancel()
+
+        self._wakeup.set()
+
+    def _watch_all(self, tasks: list):
+        return {tid: self.watch(tid) for tid in map(self._id, tasks)}
+
+    @staticmethod
+    def _id(task):
+        """Returns the task ID as an int, like FortiManager returns it in /task/task.
+        """
+
+        if isinstance(task, dict):
+            task = task_id(task)
+
+        if task is None:
+            raise ValueError("No task ID to watch.")
+
+        return int(task)
+
+    @staticmethod
+    def _results(futures: dict, return_exceptions: bool = False):
+        results = {}
+
+        for tid, future in futures.items():
+            if not future.done():
+                results[tid] = None
+            elif return_exceptions and future.exception() is not None:
+                results[tid] = future.exception()
+            else:
+                results[tid] = future.result()
+
+        return results
+
+    def _get(self, params: dict):
+        return self.api._model(FortiManager).post(method="get", params=params)
+
+    def _fail(self, error: Exception):
+        """Fails every pending task with the error.
+        """
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        self._progress.clear()
+
+        for future in pending.values():
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _run(self):
+        interval = self.interval
+        errors = 0
+
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+
+            try:
+                progress = self.poll()
+                errors = 0
+            except Exception as error:
+                progress = False
+                errors += 1
+
+                if errors >= self.max_errors:
+                    self._fail(error)
+                    errors = 0
+
+            interval = self.interval if progress else min(interval * self.backoff, self.max_interval)
+
+            # New tasks reset the interval. Wait one short interval so tasks watched together are polled together.
+            if self._wakeup.wait(timeout=interval):
+                self._wakeup.clear()
+                interval = self.interval
+                time.sleep(interval)
@@ -0,0 +1,213 @@
+import gzip
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from pyfortimanager.core.exceptions import FortiManagerError
+
+
+class Response(object):
+    """HTTP response returned by a transport other than HttpTransport.
+
+    Has the parts of requests.Response the API uses.
+    """
+
+    __slots__ = ("status_code", "reason", "headers", "content")
+
+    def __init__(self, status_code: int, reason: str = "", headers: dict = None, content: bytes = b""):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 65536):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class HttpTransport(object):
+    """Sends requests to the FortiManager with the pooled HTTP session of the API.
+    """
+
+    def send(self, api, url: str, body: bytes, headers: dict, timeout: tuple, stream: bool = False):
+        """Sends a JSON-RPC request body.
+
+        Args:
+            api (Api): The API sending the request.
+            url (str): URL of the JSON-RPC endpoint.
+            body (bytes): Request body.
+            headers (dict): Request headers.
+            timeout (tuple): Connect and read timeouts in seconds.
+            stream (bool): Read the response body while it is consumed, instead of at once. Default is False.
+
+        Raises:
+            requests.ConnectionError: The connection failed.
+            requests.Timeout: The connection or a read timed out.
+
+        Returns:
+            requests.Response: The response.
+        """
+
+        return api.session.post(url=url, data=body, verify=api.verify, headers=headers, timeout=timeout, stream=stream)
+
+    def close(self):
+        pass
+
+
+class Recorder(object):
+    """Transport that sends requests with another transport and writes each request and response to a file.
+
+    The file is gzip compressed NDJSON with one exchange per line, and can be served again with
+    Replayer. The API token is not recorded, but the payloads and responses are, so treat the
+    file like the data in the FortiManager. Streamed responses are read in full to record them.
+
+    Args:
+        path (str): File to write.
+        transport (optional): Transport to send the requests with. Defaults to HttpTransport.
+    """
+
+    def __init__(self, path: str, transport=None):
+        self.path = path
+        self.transport = transport if transport is not None else HttpTransport()
+        self._file = None
+        self._opened = False
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, api, url: str, body: bytes, headers: dict, timeout: tuple, stream: bool = False):
+        request = json.loads(body)
+        entry = {"at": round(time.monotonic() - self._start, 6), "method": request.get('method'), "params": request.get('params')}
+        start = time.perf_counter()
+
+        try:
+            with self.transport.send(api=api, url=url, body=body, headers=headers, timeout=timeout, stream=stream) as response:
+                content = response.content
+        except requests.Timeout as error:
+            self._write(dict(entry, elapsed=round(time.perf_counter() - start, 6), error="timeout", message=str(error)))
+            raise
+        except requests.ConnectionError as error:
+            self._write(dict(entry, elapsed=round(time.perf_counter() - start, 6), error="connection", message=str(error)))
+            raise
+
+        retry_after = response.headers.get('Retry-After')
+
+        self._write(dict(
+            entry,
+            elapsed=round(time.perf_counter() - start, 6),
+            status=response.status_code,
+            reason=response.reason,
+            headers={"Retry-After": retry_after} if retry_after is not None else {},
+            body=content.decode("utf-8", errors="replace")
+        ))
+
+        return Response(status_code=response.status_code, reason=response.reason, headers=response.headers, content=content)
+
+    def close(self):
+        """Closes the file. Later requests are appended to it.
+        """
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        self.transport.close()
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, separators=(",", ":")).encode() + b"\n"
+
+        with self._lock:
+            if self._file is None:
+                self._file = gzip.open(self.path, "ab" if self._opened else "wb")
+                self._opened = True
+
+            self._file.write(line)
+
+
+class Replayer(object):
+    """Transport that answers requests with the responses in a file written by Recorder, without a FortiManager.
+
+    Requests are matched on their method and payloads. A request that was recorded more than once
+    gets the recorded responses in order, and the last one again after that, so polling loops end
+    like they did when recorded.
+
+    Args:
+        path (str): File written by Recorder.
+        time_scale (float): Factor to scale the recorded response times by. 0 answers at once. Default is 1.
+    """
+
+    def __init__(self, path: str, time_scale: float = 1):
+        self.path = path
+        self.time_scale = time_scale
+        self.misses = 0
+        self._exchanges = {}
+        self._lock = threading.Lock()
+
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._exchanges.setdefault(self._key(entry['method'], entry['params']), deque()).append(entry)
+
+    def __len__(self):
+        return sum(len(exchanges) for exchanges in self._exchanges.values())
+
+    def send(self, api, url: str, body: bytes, headers: dict, timeout: tuple, stream: bool = False):
+        request = json.loads(body)
+        params = request.get('params') or []
+
+        with self._lock:
+            exchanges = self._exchanges.get(self._key(request.get('method'), params))
+
+            if not exchanges:
+                self.misses += 1
+                raise FortiManagerError(status={"code": -1, "message": "No recorded response for the request"}, url=params[0].get('url') if params else None)
+
+            entry = exchanges.popleft() if len(exchanges) > 1 else exchanges[0]
+
+        delay = entry['elapsed'] * self.time_scale
+        read_timeout = timeout[1] if timeout else None
+
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.Timeout(f"Replayed response took longer than the read timeout of {read_timeout} seconds")
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if entry.get('error') == "timeout":
+            raise requests.Timeout(entry.get('message'))
+
+        if entry.get('error') == "connection":
+            raise requests.ConnectionError(entry.get('message'))
+
+        return Response(status_code=entry['status'], reason=entry.get('reason') or "", headers=entry.get('headers'), content=entry['body'].encode("utf-8"))
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _key(method: str, params: list):
+        return json.dumps([method, params], sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,42 @@
+def chunks(items: list, size: int):
+    """Splits a list into lists of at most size items.
+
+    Args:
+        items (list): Items to split.
+        size (int): Maximum number of items in each chunk.
+
+    Returns:
+        generator: Lists of items.
+    """
+
+    items = list(items)
+
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def scope_members(fortigate, vdom: str = "root"):
+    """Builds a scope list for one or many FortiGates.
+
+    Args:
+        fortigate (str | list): Name of the FortiGate, or a list of names, (name, vdom) pairs or { "name", "vdom" } dicts.
+        vdom (str): Name of the virtual domain for FortiGates given without one. Default is root.
+
+    Returns:
+        list: { "name", "vdom" } for each FortiGate.
+    """
+
+    if isinstance(fortigate, (str, tuple, dict)):
+        fortigate = [fortigate]
+
+    members = []
+
+    for member in fortigate:
+        if isinstance(member, dict):
+            members.append({"name": member['name'], "vdom": member.get('vdom', vdom)})
+        elif isinstance(member, (tuple, list)):
+            members.append({"name": member[0], "vdom": member[1]})
+        else:
+            members.append({"name": member, "vdom": vdom})
+
+    return members
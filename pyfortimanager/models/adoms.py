@@ -8,11 +8,12 @@ class ADOMs(FortiManager):
     def __init__(self, **kwargs):
         super(ADOMs, self).__init__(**kwargs)
 
-    def all(self, name: str = None):
+    def all(self, name: str = None, fields: list = None):
         """Retrieves all ADOMs or a single ADOM.
 
         Args:
             name (str): Name of a ADOM.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -26,6 +27,9 @@ class ADOMs(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def lock(self, name: str):
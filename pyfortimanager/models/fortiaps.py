@@ -1,4 +1,5 @@
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.records import ManagedAP
 
 
 class FortiAPs(FortiManager):
@@ -8,7 +9,7 @@ class FortiAPs(FortiManager):
     def __init__(self, **kwargs):
         super(FortiAPs, self).__init__(**kwargs)
 
-    def all(self, fortigate: str = None, vdom: str = "root", wtp_id: str = None, adom: str = None):
+    def all(self, fortigate: str = None, vdom: str = "root", wtp_id: str = None, adom: str = None, fields: list = None, stream: bool = False, compact: bool = False):
         """Retrieves all FortiAPs or a single FortiAP from a FortiGate.
 
         Args:
@@ -16,9 +17,12 @@ class FortiAPs(FortiManager):
             vdom (str): Name of the virtual domain for the FortiGate.
             wtp_id (str, optional): Optional serial number of a specific FortiAP. Note: FortiGate is required to use this filter.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "wtp-id", "_conn-state"]. Defaults to all attributes.
+            stream (bool): Yield the FortiAPs one at a time while the response is decoded, instead of returning the JSON data. Default is False.
+            compact (bool): Return the FortiAPs as ManagedAP records instead of dicts. Default is False.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. A generator of the FortiAPs when stream is True.
         """
 
         params = {
@@ -39,8 +43,57 @@ class FortiAPs(FortiManager):
             if wtp_id:
                 params['url'] += f"/{wtp_id}"
 
+        if fields:
+            params['fields'] = fields
+
+        if stream and compact:
+            return self._iter_records(self.stream(method="get", params=params), ManagedAP)
+
+        if stream:
+            return self.stream(method="get", params=params)
+
+        if compact:
+            return self._records(self.post(method="get", params=params), ManagedAP)
+
         return self.post(method="get", params=params)
 
+    def iter_all(self, fortigate: str = None, vdom: str = "root", adom: str = None, fields: list = None, page_size: int = None, compact: bool = False):
+        """Retrieves all FortiAPs page by page and yields them one at a time.
+
+        Args:
+            fortigate (str, optional): Optional name of a specific FortiGate.
+            vdom (str): Name of the virtual domain for the FortiGate.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "wtp-id", "_conn-state"]. Defaults to all attributes.
+            page_size (int, optional): Number of FortiAPs per request. Defaults to the page_size set when the API was instantiated.
+            compact (bool): Yield the FortiAPs as ManagedAP records instead of dicts. Default is False.
+
+        Returns:
+            generator: JSON data for each FortiAP.
+        """
+
+        params = {
+            "url": f"/pm/config/adom/{adom or self.api.adom}/obj/wireless-controller/wtp",
+            "scope member": [
+                {
+                    "name": "All_FortiGate"
+                }
+            ]
+        }
+
+        # Optional fields
+        if fortigate:
+            params['scope member'][0]['name'] = fortigate
+            params['scope member'][0]['vdom'] = vdom
+
+        if fields:
+            params['fields'] = fields
+
+        if compact:
+            return self._iter_records(self._paginate(params=params, page_size=page_size), ManagedAP)
+
+        return self._paginate(params=params, page_size=page_size)
+
     def all_with_hostname(self, fortigate: str, vdom: str = "root", wtp_id: str = None):
         """
         Retrieves FortiAPs directly from the FortiGate device config.
@@ -369,9 +422,12 @@ class FortiAPs(FortiManager):
             ],
         }
     
-        response = self.post(method="get", params=params)
-    
-        for ap in response["data"]:
-            if ap["wtp-id"] == wtp_id:
-                return ap["_conn-state"] == 2
-        return False
+        def steps():
+            response = yield self.post(method="get", params=params)
+
+            for ap in response["data"]:
+                if ap["wtp-id"] == wtp_id:
+                    return ap["_conn-state"] == 2
+            return False
+
+        return self._drive(steps())
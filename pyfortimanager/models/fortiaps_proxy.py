@@ -1,3 +1,5 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
 
 
@@ -8,54 +10,48 @@ class FortiAPs_Proxy(FortiManager):
     def __init__(self, **kwargs):
         super(FortiAPs_Proxy, self).__init__(**kwargs)
 
-    def all(self, fortigate: str, adom: str = None, timeout: int = None):
+    def all(self, fortigate: Union[str, list], adom: str = None, timeout: int = None):
         """Retrieves a list of managed FortiAPs on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": "/api/v2/monitor/wifi/managed_ap"
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def authorize(self, wtp_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def authorize(self, wtp_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Authorizes a FortiAP on the FortiGate.
 
         Args:
             wtp_id (str): Serial number of the FortiAP to authorize.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -67,29 +63,26 @@ class FortiAPs_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def deauthorize(self, wtp_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def deauthorize(self, wtp_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Deauthorizes a FortiAP on the FortiGate.
 
         Args:
             wtp_id (str): Serial number of the FortiAP to deauthorize.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -101,29 +94,26 @@ class FortiAPs_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def restart(self, wtp_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def restart(self, wtp_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Restarts a FortiAP.
 
         Args:
             wtp_id (str): Serial number of the FortiAP to restart.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -134,32 +124,29 @@ class FortiAPs_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def clients(self, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def clients(self, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Retrieves a list of all connected Wi-Fi clients on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/wifi/client?vdom={vdom}"
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
@@ -1,4 +1,8 @@
+from pyfortimanager.core.exceptions import FortiManagerError
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.records import Device
+from pyfortimanager.core.tasks import task_id
+from pyfortimanager.core.utils import chunks
 
 
 class FortiGates(FortiManager):
@@ -8,15 +12,19 @@ class FortiGates(FortiManager):
     def __init__(self, **kwargs):
         super(FortiGates, self).__init__(**kwargs)
 
-    def all(self, fortigate: str = None, adom: str = None):
+    def all(self, fortigate: str = None, adom: str = None, fields: list = None, meta: bool = True, stream: bool = False, compact: bool = False):
         """Retrieves all FortiGates or a single FortiGate.
 
         Args:
             name (str): Name of a specific FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "sn", "ip", "conn_status", "os_ver"]. Defaults to all attributes.
+            meta (bool): Include the meta fields. Default is True.
+            stream (bool): Yield the FortiGates one at a time while the response is decoded, instead of returning the JSON data. Default is False.
+            compact (bool): Return the FortiGates as Device records instead of dicts. Default is False.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. A generator of the FortiGates when stream is True.
         """
 
         params = {
@@ -30,8 +38,55 @@ class FortiGates(FortiManager):
         if fortigate:
             params['url'] += f"/{fortigate}"
 
+        if not meta:
+            params.pop('option')
+
+        if fields:
+            params['fields'] = fields
+
+        if stream and compact:
+            return self._iter_records(self.stream(method="get", params=params), Device)
+
+        if stream:
+            return self.stream(method="get", params=params)
+
+        if compact:
+            return self._records(self.post(method="get", params=params), Device)
+
         return self.post(method="get", params=params)
 
+    def iter_all(self, adom: str = None, fields: list = None, meta: bool = True, page_size: int = None, compact: bool = False):
+        """Retrieves all FortiGates page by page and yields them one at a time.
+
+        Args:
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "sn", "ip", "conn_status", "os_ver"]. Defaults to all attributes.
+            meta (bool): Include the meta fields. Default is True.
+            page_size (int, optional): Number of FortiGates per request. Defaults to the page_size set when the API was instantiated.
+            compact (bool): Yield the FortiGates as Device records instead of dicts. Default is False.
+
+        Returns:
+            generator: JSON data for each FortiGate.
+        """
+
+        params = {
+            "url": f"/dvmdb/adom/{adom or self.api.adom}/device",
+            "option": [
+                "get meta"
+            ]
+        }
+
+        if not meta:
+            params.pop('option')
+
+        if fields:
+            params['fields'] = fields
+
+        if compact:
+            return self._iter_records(self._paginate(params=params, page_size=page_size), Device)
+
+        return self._paginate(params=params, page_size=page_size)
+
     def upgrade(self, fortigate: str, image: str, adom: str = None):
         """Upgrades the firmware on the FortiGate.
 
@@ -135,41 +190,133 @@ class FortiGates(FortiManager):
             "url": "/dvm/cmd/add/device",
             "data": {
                 "adom": adom or self.api.adom,
-                "device": {
-                    "flags": flags,
-                    "mgmt_mode": mgmt_mode,
-                    "mr": mr,
-                    "name": name or serial,
-                    "os_type": os_type,
-                    "os_ver": os_ver,
-                    "sn": serial
+                "device": self._device(serial=serial, mr=mr, os_ver=os_ver, name=name, mgmt_mode=mgmt_mode, os_type=os_type, adm_usr=adm_usr, adm_pass=adm_pass, description=description, meta_fields=meta_fields, flags=flags, prefer_img_ver=prefer_img_ver, branch_pt=branch_pt, build=build)
+            }
+        }
+
+        return self.post(method="exec", params=params)
+
+    def add_many(self, devices: list, chunk_size: int = 100, wait: bool = True, timeout: float = None, adom: str = None):
+        """Adds many FortiGates as model devices in FortiManager, with one nonblocking call per chunk.
+
+        Args:
+            devices (list): A dict for each FortiGate, with the same fields as add(). Ex. [{ "serial": "FGT60FTK1234ABCD", "mr": 0, "os_ver": 7, "meta_fields": { "site": "1234" } }]
+            chunk_size (int): Maximum number of FortiGates added per call. Default is 100.
+            wait (bool): Follow the tasks until they finish and report the result per FortiGate. Default is True.
+            timeout (float, optional): Maximum seconds to wait for the tasks. Defaults to no limit.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+
+        Returns:
+            dict: The task and status for each FortiGate, keyed by name. The status is None if the task has not finished.
+        """
+
+        return self._drive(self._add_many(devices, chunk_size=chunk_size, wait=wait, timeout=timeout, adom=adom))
+
+    def _add_many(self, devices: list, chunk_size: int = 100, wait: bool = True, timeout: float = None, adom: str = None):
+        """Adds the FortiGates and follows the tasks. A generator of steps, run by _drive().
+        """
+
+        results = {}
+        tasks = []
+
+        for chunk in chunks(devices, chunk_size):
+            params = {
+                "url": "/dvm/cmd/add/dev-list",
+                "data": {
+                    "adom": adom or self.api.adom,
+                    "flags": [
+                        "create_task",
+                        "nonblocking"
+                    ],
+                    "add-dev-list": [self._device(**device) for device in chunk]
                 }
             }
+
+            response = yield self.post(method="exec", params=params)
+            task = task_id(response)
+            names = [device['name'] for device in params['data']['add-dev-list']]
+
+            for name in names:
+                results[name] = {
+                    "task": task,
+                    "status": None if task else (response or {}).get('status', {"code": -1, "message": "No response from the FortiManager"})
+                }
+
+            if task:
+                tasks.append((task, names))
+
+        if not wait or not tasks:
+            return results
+
+        with self.api.task_waiter() as waiter:
+            finished = yield waiter.wait([task for task, names in tasks], timeout=timeout, return_exceptions=True)
+
+        for task, names in tasks:
+            # The task does not exist, or could not be polled
+            if isinstance(finished.get(task), Exception):
+                error = finished[task]
+
+                for name in names:
+                    results[name]['status'] = error.status if isinstance(error, FortiManagerError) else {"code": -1, "message": str(error)}
+
+                continue
+
+            lines = {line.get('name'): line for line in (finished.get(task) or {}).get('line') or []}
+
+            for name in names:
+                line = lines.get(name)
+
+                if line:
+                    results[name]['status'] = {
+                        "code": line.get('err', 0),
+                        "message": line.get('detail') or "OK"
+                    }
+                elif finished.get(task):
+                    results[name]['status'] = {
+                        "code": -1,
+                        "message": "FortiGate not found in the task"
+                    }
+
+        return results
+
+    @staticmethod
+    def _device(serial: str, mr: int, os_ver: int, name: str = None, mgmt_mode: str = "fmg", os_type: str = "fos", adm_usr: str = None, adm_pass: str = None, description: str = None, meta_fields: dict = None, flags: int = 67371040, prefer_img_ver: str = None, branch_pt: int = None, build: int = None):
+        """Builds the device object for adding a model device.
+        """
+
+        device = {
+            "flags": flags,
+            "mgmt_mode": mgmt_mode,
+            "mr": mr,
+            "name": name or serial,
+            "os_type": os_type,
+            "os_ver": os_ver,
+            "sn": serial
         }
 
         # Optional fields
         if adm_usr:
-            params['data']['device']['adm_usr'] = adm_usr
+            device['adm_usr'] = adm_usr
 
         if adm_pass:
-            params['data']['device']['adm_pass'] = adm_pass
+            device['adm_pass'] = adm_pass
 
         if description:
-            params['data']['device']['desc'] = description
+            device['desc'] = description
 
         if meta_fields:
-            params['data']['device']['meta fields'] = meta_fields
+            device['meta fields'] = meta_fields
 
         if prefer_img_ver:
-            params['data']['device']['prefer_img_ver'] = prefer_img_ver
-        
+            device['prefer_img_ver'] = prefer_img_ver
+
         if branch_pt:
-            params['data']['device']['branch_pt'] = branch_pt
+            device['branch_pt'] = branch_pt
 
         if build:
-            params['data']['device']['build'] = build
+            device['build'] = build
 
-        return self.post(method="exec", params=params)
+        return device
 
     def update(self, fortigate: str, meta_fields: dict = None, adm_pass: str = None, adm_usr: str = None, description: str = None, ip: str = None, latitude: float = None, longitude: float = None, name: str = None, hostname: str = None, prefer_img_ver: str = None, adom: str = None):
         """Updates a FortiGate.
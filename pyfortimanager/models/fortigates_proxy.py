@@ -1,3 +1,5 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
 
 
@@ -8,38 +10,35 @@ class FortiGates_Proxy(FortiManager):
     def __init__(self, **kwargs):
         super(FortiGates_Proxy, self).__init__(**kwargs)
 
-    def status(self, fortigate: str, adom: str = None, timeout: int = None):
+    def status(self, fortigate: Union[str, list], adom: str = None, timeout: int = None):
         """Retrieve basic system status on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/system/status"
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def resource_usage(self, fortigate: str, adom: str = None, scope: str = "global", resource: str = None, interval: str = None, timeout: int = None):
+    def resource_usage(self, fortigate: Union[str, list], adom: str = None, scope: str = "global", resource: str = None, interval: str = None, timeout: int = None):
         """Retrieves current and historical usage data for a provided resource on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             scope (str): Scope from which to retrieve the interface stats from [vdom|global]. Default is global.
             resource (str. optional): Get a specific resource to get usage data for. Defaults to all resources. 
@@ -47,16 +46,13 @@ class FortiGates_Proxy(FortiManager):
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/system/resource/usage/?scope={scope}"
@@ -70,13 +66,13 @@ class FortiGates_Proxy(FortiManager):
         if interval:
             params['data']['resource'] += f"&interval={interval}"
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def interfaces(self, fortigate: str, adom: str = None, scope: str = "global", include_vlan: bool = True, include_aggregate: bool = True, interface: str = None, timeout: int = None):
+    def interfaces(self, fortigate: Union[str, list], adom: str = None, scope: str = "global", include_vlan: bool = True, include_aggregate: bool = True, interface: str = None, timeout: int = None):
         """Retrieves a list of interfaces or a specific interface and their configuration on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             scope (str): Scope from which to retrieve the interface stats from [vdom|global]. Default is global.
             include_vlan (bool): Enable to include VLANs in result list. Default is True.
@@ -85,16 +81,13 @@ class FortiGates_Proxy(FortiManager):
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/system/interface/?scope={scope}&include_vlan={include_vlan}&include_aggregate={include_aggregate}"
@@ -105,41 +98,38 @@ class FortiGates_Proxy(FortiManager):
         if interface:
             params['data']['resource'] += f"&interface_name={interface}"
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def transceivers(self, fortigate: str, adom: str = None, scope: str = "global", timeout: int = None):
+    def transceivers(self, fortigate: Union[str, list], adom: str = None, scope: str = "global", timeout: int = None):
         """Retrieves a list of transceivers used on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             scope (str): Scope from which to retrieve the interface stats from [vdom|global]. Default is global.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/system/interface/transceivers?scope={scope}"
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def dhcp_leases(self, fortigate: str, adom: str = None, scope: str = "global", ipv6: bool = True, interface: str = None, timeout: int = None):
+    def dhcp_leases(self, fortigate: Union[str, list], adom: str = None, scope: str = "global", ipv6: bool = True, interface: str = None, timeout: int = None):
         """Retrieves a list of all DHCP and DHCPv6 leases on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             scope (str): Scope from which to retrieve the interface stats from [vdom|global]. Default is global.
             ipv6 (bool): Include IPv6 addresses in the response. Default is True.
@@ -147,16 +137,13 @@ class FortiGates_Proxy(FortiManager):
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "timeout": timeout or self.api.proxy_timeout,
                     "resource": f"/api/v2/monitor/system/dhcp/?scope={scope}&ipv6={ipv6}"
@@ -167,4 +154,4 @@ class FortiGates_Proxy(FortiManager):
         if interface:
             params['data']['resource'] += f"&interface={interface}"
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
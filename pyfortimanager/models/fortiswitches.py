@@ -1,4 +1,5 @@
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.records import ManagedSwitch
 
 
 class FortiSwitches(FortiManager):
@@ -8,7 +9,7 @@ class FortiSwitches(FortiManager):
     def __init__(self, **kwargs):
         super(FortiSwitches, self).__init__(**kwargs)
 
-    def all(self, fortigate: str = None, vdom: str = "root", switch_id: str = None, adom: str = None):
+    def all(self, fortigate: str = None, vdom: str = "root", switch_id: str = None, adom: str = None, fields: list = None, stream: bool = False, compact: bool = False):
         """Retrieves all FortiSwitches or a single FortiSwitch from a FortiGate.
 
         Args:
@@ -16,9 +17,12 @@ class FortiSwitches(FortiManager):
             vdom (str): Name of the virtual domain for the FortiGate.
             switch_id (str, optional): Optional serial number of a specific FortiSwitch. Note: FortiGate is required to use this filter.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "switch-id"]. Defaults to all attributes.
+            stream (bool): Yield the FortiSwitches one at a time while the response is decoded, instead of returning the JSON data. Default is False.
+            compact (bool): Return the FortiSwitches as ManagedSwitch records instead of dicts. Default is False.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. A generator of the FortiSwitches when stream is True.
         """
 
         params = {
@@ -39,8 +43,57 @@ class FortiSwitches(FortiManager):
             if switch_id:
                 params['url'] += f"/{switch_id}"
 
+        if fields:
+            params['fields'] = fields
+
+        if stream and compact:
+            return self._iter_records(self.stream(method="get", params=params), ManagedSwitch)
+
+        if stream:
+            return self.stream(method="get", params=params)
+
+        if compact:
+            return self._records(self.post(method="get", params=params), ManagedSwitch)
+
         return self.post(method="get", params=params)
 
+    def iter_all(self, fortigate: str = None, vdom: str = "root", adom: str = None, fields: list = None, page_size: int = None, compact: bool = False):
+        """Retrieves all FortiSwitches page by page and yields them one at a time.
+
+        Args:
+            fortigate (str, optional): Optional name of a specific FortiGate.
+            vdom (str): Name of the virtual domain for the FortiGate.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name", "switch-id"]. Defaults to all attributes.
+            page_size (int, optional): Number of FortiSwitches per request. Defaults to the page_size set when the API was instantiated.
+            compact (bool): Yield the FortiSwitches as ManagedSwitch records instead of dicts. Default is False.
+
+        Returns:
+            generator: JSON data for each FortiSwitch.
+        """
+
+        params = {
+            "url": f"/pm/config/adom/{adom or self.api.adom}/obj/fsp/managed-switch",
+            "scope member": [
+                {
+                    "name": "All_FortiGate"
+                }
+            ]
+        }
+
+        # Optional fields
+        if fortigate:
+            params['scope member'][0]['name'] = fortigate
+            params['scope member'][0]['vdom'] = vdom
+
+        if fields:
+            params['fields'] = fields
+
+        if compact:
+            return self._iter_records(self._paginate(params=params, page_size=page_size), ManagedSwitch)
+
+        return self._paginate(params=params, page_size=page_size)
+
     def upgrade(self, fortigate: str, switch_id: str, image: str):
         """Updates the firmware of a specific FortiSwitch.
 
@@ -1,3 +1,5 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
 
 
@@ -8,26 +10,23 @@ class FortiSwitches_Proxy(FortiManager):
     def __init__(self, **kwargs):
         super(FortiSwitches_Proxy, self).__init__(**kwargs)
 
-    def all(self, fortigate: str, switch_id: str = None, adom: str = None, timeout: int = None):
+    def all(self, fortigate: Union[str, list], switch_id: str = None, adom: str = None, timeout: int = None):
         """Retrieves a list of all or a single managed FortiSwitches on the FortiGate.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             switch_id (str, optional): Serial number of a specific FortiSwitch.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "get",
                     "resource": f"/api/v2/monitor/switch-controller/managed-switch/status"
                 }
@@ -37,29 +36,26 @@ class FortiSwitches_Proxy(FortiManager):
         if switch_id:
             params['data']['resource'] += f"?mkey={switch_id}"
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def authorize(self, switch_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def authorize(self, switch_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Authorizes a FortiSwitch on the FortiGate.
 
         Args:
             switch_id (str): Serial number of the FortiSwitch to authorize.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -71,29 +67,26 @@ class FortiSwitches_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def deauthorize(self, switch_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def deauthorize(self, switch_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Deauthorizes a FortiSwitch on the FortiGate.
 
         Args:
             switch_id (str): Serial number of the FortiSwitch to deauthorize.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -105,29 +98,26 @@ class FortiSwitches_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
 
-    def restart(self, switch_id: str, fortigate: str, vdom: str = "root", adom: str = None, timeout: int = None):
+    def restart(self, switch_id: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, timeout: int = None):
         """Restarts a FortiSwitch.
 
         Args:
             switch_id (str): Serial number of the FortiSwitch to restart.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names to send the call to many FortiGates at once.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
             timeout (int, optional): How long to wait for the FortiGate to respond. Defaults to the proxy_timeout set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the data for each FortiGate keyed by name.
         """
 
         params = {
             "url": "/sys/proxy/json",
             "data":
                 {
-                    "target": [
-                        f"/adom/{adom or self.api.adom}/device/{fortigate}"
-                    ],
                     "action": "post",
                     "payload": {
                         "vdom": vdom,
@@ -138,4 +128,4 @@ class FortiSwitches_Proxy(FortiManager):
                 }
         }
 
-        return self.post(method="exec", params=params)
+        return self._proxy(fortigate=fortigate, params=params, adom=adom)
@@ -1,4 +1,8 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.tasks import task_id
+from pyfortimanager.core.utils import chunks, scope_members
 
 
 class Install_Wizard(FortiManager):
@@ -8,44 +12,44 @@ class Install_Wizard(FortiManager):
     def __init__(self, **kwargs):
         super(Install_Wizard, self).__init__(**kwargs)
 
-    def device_settings(self, fortigate: str, vdom: str = "root", adom: str = None):
-        """Installs the device settings on a FortiGate.
+    def device_settings(self, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
+        """Installs the device settings on one or many FortiGates.
 
         Args:
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per install task. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the task IDs and the response for each chunk.
         """
 
         params = {
             "url": "/securityconsole/install/device",
             "data": {
                 "adom": adom or self.api.adom,
-                "scope": [
-                    {
-                        "name": fortigate,
-                        "vdom": vdom
-                    }
-                ],
+                "scope": scope_members(fortigate, vdom),
             }
         }
 
-        return self.post(method="exec", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="exec", params=params)
+
+        return self._drive(self._install(params=params, chunk_size=chunk_size))
 
-    def policy_package(self, policy_package: str, fortigate: str, vdom: str = "root", adom: str = None):
-        """Installs a policy package on a FortiGate.
+    def policy_package(self, policy_package: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
+        """Installs a policy package on one or many FortiGates.
 
         Args:
             policy_package (str): Name of the policy package to be installed.
-            fortigate (str): Name of the FortiGate.
+            fortigate (str | list): Name of the FortiGate, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per install task. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, the task IDs and the response for each chunk.
         """
 
         params = {
@@ -54,13 +58,30 @@ class Install_Wizard(FortiManager):
                 "adom": adom or self.api.adom,
                 "flags": "nonblocking",
                 "pkg": policy_package,
-                "scope": [
-                    {
-                        "name": fortigate,
-                        "vdom": vdom
-                    }
-                ],
+                "scope": scope_members(fortigate, vdom),
             }
         }
 
-        return self.post(method="exec", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="exec", params=params)
+
+        return self._drive(self._install(params=params, chunk_size=chunk_size))
+
+    def _install(self, params: dict, chunk_size: int = None):
+        """Sends an install call for each chunk of the scope. A generator of steps, run by _drive().
+
+        Returns:
+            dict: { "tasks": [task IDs], "responses": [JSON data for each chunk] }
+        """
+
+        responses = []
+
+        for chunk in chunks(params['data']['scope'], chunk_size or self.api.scope_chunk_size):
+            responses.append((yield self.post(method="exec", params=dict(params, data=dict(params['data'], scope=chunk)))))
+
+        tasks = [task_id(response) for response in responses]
+
+        return {
+            "tasks": [task for task in tasks if task is not None],
+            "responses": responses
+        }
@@ -1,4 +1,6 @@
+from pyfortimanager.core.exceptions import FortiManagerError
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.utils import chunks
 
 
 class MetadataVariables(FortiManager):
@@ -8,12 +10,13 @@ class MetadataVariables(FortiManager):
     def __init__(self, **kwargs):
         super(MetadataVariables, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None):
         """Retrieves all metadata variables or a single metadata variable with members.
 
         Args:
             name (str, optional): Name of a specific variable.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -30,6 +33,9 @@ class MetadataVariables(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def add(self, name: str, description: str = None, default_value: str = None, revision_note: str = None, adom: str = None):
@@ -190,3 +196,108 @@ class MetadataVariables(FortiManager):
         }
 
         return self.post(method="delete", params=params)
+
+    def reconcile(self, desired: dict, prune: bool = True, adom: str = None, chunk_size: int = None):
+        """Brings the members of metadata variables in line with a desired state.
+
+        The current members of all variables are retrieved in one request. Only the members that
+        differ are added, updated or removed, and the changes are sent as batched writes. Nothing
+        is written when the variables already match.
+
+        Args:
+            desired (dict): Value per member for each variable. Members are "fortigate/vdom", or "fortigate" for the global VDOM. Ex. {"site_id": {"FGT-1": "1234", "FGT-2/root": "1235"}}
+            prune (bool): Remove members that are not in desired. Default is True.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of members per write. Defaults to the scope_chunk_size set when the API was instantiated.
+
+        Raises:
+            FortiManagerError: The members of a variable could not be retrieved.
+
+        Returns:
+            dict: The members added, updated and removed for each variable, and the JSON data for each write.
+        """
+
+        return self._drive(self._reconcile(desired=desired, prune=prune, adom=adom, chunk_size=chunk_size))
+
+    def _reconcile(self, desired: dict, prune: bool = True, adom: str = None, chunk_size: int = None):
+        """Reconciles the metadata variables. A generator of steps, run by _drive().
+        """
+
+        url = f"/pm/config/adom/{adom or self.api.adom}/obj/fmg/variable"
+        variables = list(desired)
+
+        # Retrieve the current members of every variable in one request
+        batch = self.api.batch()
+
+        for variable in variables:
+            batch.queue(method="get", params={"url": f"{url}/{variable}/dynamic_mapping"})
+
+        changes = {}
+        adds, updates, deletes = [], [], []
+
+        for variable, response in zip(variables, (yield batch.send())):
+            if not response or response.get('status', {}).get('code') != 0:
+                raise FortiManagerError(status=(response or {}).get('status'), url=f"{url}/{variable}/dynamic_mapping")
+
+            current = {}
+
+            for mapping in response.get('data') or []:
+                for scope in mapping.get('_scope') or []:
+                    current[(scope.get('name'), scope.get('vdom'))] = mapping.get('value')
+
+            wanted = {}
+
+            for member, value in desired[variable].items():
+                fortigate, _, vdom = member.partition("/")
+                wanted[(fortigate, vdom or "global")] = str(value)
+
+            add = {member: value for member, value in wanted.items() if member not in current}
+            update = {member: value for member, value in wanted.items() if member in current and current[member] != value}
+            delete = [member for member in current if member not in wanted] if prune else []
+
+            changes[variable] = {
+                "add": {f"{fortigate}/{vdom}": value for (fortigate, vdom), value in add.items()},
+                "update": {f"{fortigate}/{vdom}": value for (fortigate, vdom), value in update.items()},
+                "delete": [f"{fortigate}/{vdom}" for fortigate, vdom in delete]
+            }
+
+            for chunk in chunks(list(add.items()), chunk_size or self.api.scope_chunk_size):
+                adds.append({"url": f"{url}/{variable}/dynamic_mapping", "data": [self._mapping(fortigate, vdom, value) for (fortigate, vdom), value in chunk]})
+
+            for chunk in chunks(list(update.items()), chunk_size or self.api.scope_chunk_size):
+                updates.append({"url": f"{url}/{variable}/dynamic_mapping", "data": [self._mapping(fortigate, vdom, value) for (fortigate, vdom), value in chunk]})
+
+            for fortigate, vdom in delete:
+                deletes.append({"url": f"{url}/{variable}/dynamic_mapping/{fortigate}/{vdom}"})
+
+        # Calls with the same method are combined, so this is one request per method unless the batch is split by size
+        responses = []
+
+        if adds or updates or deletes:
+            batch = self.api.batch()
+
+            for method, writes in (("delete", deletes), ("update", updates), ("add", adds)):
+                for params in writes:
+                    batch.queue(method=method, params=params)
+
+            responses = yield batch.send()
+
+        return {
+            "changes": changes,
+            "responses": responses
+        }
+
+    @staticmethod
+    def _mapping(fortigate: str, vdom: str, value: str):
+        """Returns a dynamic mapping for a single FortiGate.
+        """
+
+        return {
+            "_scope": [
+                {
+                    "name": fortigate,
+                    "vdom": vdom
+                }
+            ],
+            "value": value
+        }
@@ -1,4 +1,7 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.utils import chunks, scope_members
 
 
 class Policy_Packages(FortiManager):
@@ -8,12 +11,13 @@ class Policy_Packages(FortiManager):
     def __init__(self, **kwargs):
         super(Policy_Packages, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None):
         """Retrieves all policy packages or a single policy package with members.
 
         Args:
             name (str, optional): Name of a policy package.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -27,6 +31,9 @@ class Policy_Packages(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def add(self, name: str, ngfw_mode: int = 0, central_nat: int = 0, policy_offload_level: int = 0, subfolder: str = None, adom: str = None):
@@ -255,73 +262,97 @@ class Policy_Packages(FortiManager):
 
         return self.post(method="update", params=params)
 
-    def add_member(self, name: str, fortigate: str, vdom: str = "root", adom: str = None):
+    def add_member(self, name: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
         """Adds a FortiGate as a member to a policy package.
 
         Args:
             name (str): Name of the policy package.
-            fortigate (str): Name of the FortiGate to be added as a member.
+            fortigate (str | list): Name of the FortiGate to be added as a member, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per call. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, a list with the JSON data for each chunk.
         """
 
         params = {
             "url": f"/pm/pkg/adom/{adom or self.api.adom}/{name}/scope member",
-            "data": [
-                {
-                    "name": fortigate,
-                    "vdom": vdom
-                }
-            ]
+            "data": scope_members(fortigate, vdom)
         }
 
-        return self.post(method="add", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="add", params=params)
 
-    def remove_member(self, name: str, fortigate: str, vdom: str = "root", adom: str = None):
+        return self._chunked(method="add", params=params, chunk_size=chunk_size)
+
+    def remove_member(self, name: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
         """Removes a FortiGate as a member from a policy package.
 
         Args:
             name (str): Name of the policy package.
-            fortigate (str): Name of the FortiGate to remove as a member.
+            fortigate (str | list): Name of the FortiGate to remove as a member, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per call. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, a list with the JSON data for each chunk.
         """
 
         params = {
             "url": f"/pm/pkg/adom/{adom or self.api.adom}/{name}/scope member",
-            "data": [
-                {
-                    "name": fortigate,
-                    "vdom": vdom
-                }
-            ]
+            "data": scope_members(fortigate, vdom)
         }
 
-        return self.post(method="delete", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="delete", params=params)
 
-    def firewall_policies(self, name: str, adom: str = None):
+        return self._chunked(method="delete", params=params, chunk_size=chunk_size)
+
+    def firewall_policies(self, name: str, adom: str = None, stream: bool = False):
         """Retrieves all firewall policies in a policy package.
 
         Args:
             name (str): Name of the policy package.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            stream (bool): Yield the firewall policies one at a time while the response is decoded, instead of returning the JSON data. Default is False.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. A generator of the firewall policies when stream is True.
         """
 
         params = {
             "url": f"/pm/config/adom/{adom or self.api.adom}/pkg/{name}/firewall/policy"
         }
 
+        if stream:
+            return self.stream(method="get", params=params)
+
         return self.post(method="get", params=params)
 
+    def iter_firewall_policies(self, name: str, adom: str = None, fields: list = None, page_size: int = None):
+        """Retrieves all firewall policies in a policy package page by page and yields them one at a time.
+
+        Args:
+            name (str): Name of the policy package.
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["policyid", "name", "status"]. Defaults to all attributes.
+            page_size (int, optional): Number of policies per request. Defaults to the page_size set when the API was instantiated.
+
+        Returns:
+            generator: JSON data for each firewall policy.
+        """
+
+        params = {
+            "url": f"/pm/config/adom/{adom or self.api.adom}/pkg/{name}/firewall/policy"
+        }
+
+        if fields:
+            params['fields'] = fields
+
+        return self._paginate(params=params, page_size=page_size)
+
     def firewall_policy_disable(self, id: int, policy_package: str, adom: str = None):
         """Disables a firewall policy in a policy package.
 
@@ -363,3 +394,74 @@ class Policy_Packages(FortiManager):
         }
 
         return self.post(method="update", params=params)
+
+    def firewall_policies_disable(self, policy_package: str, ids: list = None, where=None, adom: str = None, chunk_size: int = None):
+        """Disables many firewall policies in a policy package with a few update calls.
+
+        Args:
+            policy_package (str): Name of the policy package.
+            ids (list, optional): Policy IDs to disable.
+            where (callable, optional): Disable the firewall policies it returns True for, called with each firewall policy in the package. Ex. lambda policy: "quarantine" in policy['name']
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of policies per call. Defaults to the scope_chunk_size set when the API was instantiated.
+
+        Returns:
+            dict: The status for each policy ID.
+        """
+
+        return self._drive(self._firewall_policies_status(status=0, policy_package=policy_package, ids=ids, where=where, adom=adom, chunk_size=chunk_size))
+
+    def firewall_policies_enable(self, policy_package: str, ids: list = None, where=None, adom: str = None, chunk_size: int = None):
+        """Enables many firewall policies in a policy package with a few update calls.
+
+        Args:
+            policy_package (str): Name of the policy package.
+            ids (list, optional): Policy IDs to enable.
+            where (callable, optional): Enable the firewall policies it returns True for, called with each firewall policy in the package. Ex. lambda policy: "quarantine" in policy['name']
+            adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of policies per call. Defaults to the scope_chunk_size set when the API was instantiated.
+
+        Returns:
+            dict: The status for each policy ID.
+        """
+
+        return self._drive(self._firewall_policies_status(status=1, policy_package=policy_package, ids=ids, where=where, adom=adom, chunk_size=chunk_size))
+
+    def _firewall_policies_status(self, status: int, policy_package: str, ids: list = None, where=None, adom: str = None, chunk_size: int = None):
+        """Sets the status of many firewall policies with one update call per chunk.
+
+        FortiManager rejects an update call as a whole, so the policies of a failed chunk are
+        retried one by one, in a single batched request, to find the status of each ID. A generator
+        of steps, run by _drive().
+        """
+
+        url = f"/pm/config/adom/{adom or self.api.adom}/pkg/{policy_package}/firewall/policy"
+        ids = list(ids or [])
+
+        if where is not None:
+            policies = yield self.iter_firewall_policies(name=policy_package, adom=adom)
+            ids += [policy['policyid'] for policy in policies if where(policy)]
+
+        results = {}
+
+        for chunk in chunks(list(dict.fromkeys(ids)), chunk_size or self.api.scope_chunk_size):
+            params = {
+                "url": url,
+                "data": [{"policyid": id, "status": status} for id in chunk]
+            }
+
+            response = yield self.post(method="update", params=params)
+
+            if response and response.get('status', {}).get('code') == 0:
+                results.update({id: response['status'] for id in chunk})
+                continue
+
+            batch = self.api.batch()
+
+            for id in chunk:
+                batch.queue(method="update", params={"url": f"{url}/{id}", "data": {"status": status}})
+
+            for id, result in zip(chunk, (yield batch.send())):
+                results[id] = (result or {}).get('status') or {"code": -1, "message": "No response from the FortiManager"}
+
+        return results
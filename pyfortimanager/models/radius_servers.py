@@ -8,12 +8,13 @@ class RADIUS_Servers(FortiManager):
     def __init__(self, **kwargs):
         super(RADIUS_Servers, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None):
         """Retrieves all RADIUS servers or a single RADIUS server.
 
         Args:
             name (str): Name of the radius server.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -26,6 +27,9 @@ class RADIUS_Servers(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def add_member(self, fortigate: str, fortigate_source_ip: str, fortigate_nas_ip: str, radius_server: str, radius_server_ip: str, radius_secret: str, radius_secondary_server_ip: str = None, radius_secondary_secret: str = None, vdom: str = "root", adom: str = None):
@@ -8,12 +8,13 @@ class Scripts(FortiManager):
     def __init__(self, **kwargs):
         super(Scripts, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None):
         """Retrieves a list of all scripts or a single script.
 
         Args:
             name (str): Name of a script.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -27,6 +28,9 @@ class Scripts(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def execute(self, name: str, fortigate: str, vdom: str = "root", adom: str = None):
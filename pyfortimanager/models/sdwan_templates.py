@@ -1,4 +1,7 @@
+from typing import Union
+
 from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.utils import scope_members
 
 
 class SDWAN_Templates(FortiManager):
@@ -8,12 +11,13 @@ class SDWAN_Templates(FortiManager):
     def __init__(self, **kwargs):
         super(SDWAN_Templates, self).__init__(**kwargs)
 
-    def all(self, name: str = None, adom: str = None):
+    def all(self, name: str = None, adom: str = None, fields: list = None):
         """Retrieves all SD-WAN templates or a single SD-WAN template with members.
 
         Args:
             name (str): Name of the SD-WAN template.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            fields (list, optional): Only return these attributes. Ex. ["name"]. Defaults to all attributes.
 
         Returns:
             dict: JSON data.
@@ -27,6 +31,9 @@ class SDWAN_Templates(FortiManager):
         if name:
             params['url'] += f"/{name}"
 
+        if fields:
+            params['fields'] = fields
+
         return self.post(method="get", params=params)
 
     def delete(self, name: str, adom: str = None):
@@ -47,52 +54,50 @@ class SDWAN_Templates(FortiManager):
 
         return self.post(method="delete", params=params)
 
-    def add_member(self, name: str, fortigate: str, vdom: str = "root", adom: str = None):
+    def add_member(self, name: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
         """Adds a FortiGate as a member to a SD-WAN template.
 
         Args:
             name (str): Name of the SD-WAN template.
-            fortigate (str): Name of the FortiGate to add as a member.
+            fortigate (str | list): Name of the FortiGate to add as a member, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per call. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, a list with the JSON data for each chunk.
         """
 
         params = {
             "url": f"/pm/wanprof/adom/{adom or self.api.adom}/{name}/scope member",
-            "data": [
-                {
-                    "name": fortigate,
-                    "vdom": vdom
-                }
-            ]
+            "data": scope_members(fortigate, vdom)
         }
 
-        return self.post(method="add", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="add", params=params)
+
+        return self._chunked(method="add", params=params, chunk_size=chunk_size)
 
-    def remove_member(self, name: str, fortigate: str, vdom: str = "root", adom: str = None):
+    def remove_member(self, name: str, fortigate: Union[str, list], vdom: str = "root", adom: str = None, chunk_size: int = None):
         """Removes a FortiGate as a member from a SD-WAN template.
 
         Args:
             name (str): Name of the SD-WAN template.
-            fortigate (str): Name of the FortiGate to remove as a member.
+            fortigate (str | list): Name of the FortiGate to remove as a member, or a list of names or (name, vdom) pairs.
             vdom (str): Name of the virtual domain for the FortiGate.
             adom (str): Name of the ADOM. Defaults to the ADOM set when the API was instantiated.
+            chunk_size (int, optional): Maximum number of FortiGates per call. Defaults to the scope_chunk_size set when the API was instantiated.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. For a list of FortiGates, a list with the JSON data for each chunk.
         """
 
         params = {
             "url": f"/pm/wanprof/adom/{adom or self.api.adom}/{name}/scope member",
-            "data": [
-                {
-                    "name": fortigate,
-                    "vdom": vdom
-                }
-            ]
+            "data": scope_members(fortigate, vdom)
         }
 
-        return self.post(method="delete", params=params)
+        if isinstance(fortigate, str):
+            return self.post(method="delete", params=params)
+
+        return self._chunked(method="delete", params=params, chunk_size=chunk_size)
@@ -8,19 +8,23 @@ class System(FortiManager):
     def __init__(self, **kwargs):
         super(System, self).__init__(**kwargs)
 
-    def custom_request(self, params: dict = None, method: str = "get"):
+    def custom_request(self, params: dict = None, method: str = "get", stream: bool = False):
         """Send a custom request to the FortiManager API.
 
         Args:
             params (dict): Payload parameters to send with the request.
             method (str): get, exec, add, set, update, delete. Default is get.
+            stream (bool): Yield the items in data one at a time while the response is decoded, instead of returning the JSON data. Default is False.
 
         Returns:
-            dict: JSON data.
+            dict: JSON data. A generator of the items in data when stream is True.
         """
 
         params = params
 
+        if stream:
+            return self.stream(method=method, params=params)
+
         return self.post(method=method, params=params)
 
     def firmware(self, platform: str = None, product: str = None):
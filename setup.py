@@ -19,6 +19,11 @@ setup(
     install_requires=[
         "requests>=2.20.0,<3.0"
     ],
+    extras_require={
+        "async": [
+            "aiohttp>=3.8.0,<4.0"
+        ]
+    },
     zip_safe=False,
     keywords=[
         "fortinet",
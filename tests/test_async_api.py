@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.async_api import AsyncApi
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.simulator import Simulator
+
+
+def both(call, **options):
+    """Runs call(api) with the Api and with the AsyncApi, each against a fresh simulator, and returns both results."""
+
+    with Simulator(devices=10, aps_per_device=1, policies=10, task_duration=0.1) as sim:
+        with Api(host=sim.url, token="token", scope_chunk_size=3) as api:
+            result = call(api)
+
+    async def run(url):
+        async with AsyncApi(host=url, token="token", scope_chunk_size=3) as api:
+            return await call(api)
+
+    with Simulator(devices=10, aps_per_device=1, policies=10, task_duration=0.1) as sim:
+        return result, asyncio.run(run(sim.url))
+
+
+def test_sync_context_managers_are_refused():
+    api = AsyncApi(host="https://fortimanager.example.com", token="token")
+
+    with pytest.raises(TypeError):
+        with api:
+            pass
+
+    with pytest.raises(TypeError):
+        with api.batch():
+            pass
+
+
+def test_add_many():
+    devices = [{"serial": f"FGT60F{index:010d}", "mr": 2, "os_ver": 7} for index in range(5)]
+    result, awaited = both(lambda api: api.fortigates.add_many(devices, chunk_size=2, timeout=10))
+
+    assert awaited == result
+    assert [device['task'] for device in result.values()] == [1, 1, 2, 2, 3]
+    assert all(device['status'] == {"code": 0, "message": "OK"} for device in result.values())
+
+
+def test_install_on_many_fortigates():
+    fortigates = [f"FGT-{index:05d}" for index in range(7)]
+    result, awaited = both(lambda api: api.install_wizard.policy_package(policy_package="default", fortigate=fortigates))
+
+    assert awaited == result
+    assert result['tasks'] == [1, 2, 3]
+
+    result, awaited = both(lambda api: api.install_wizard.device_settings(fortigate=fortigates))
+
+    assert awaited == result
+    assert len(result['responses']) == 3
+
+
+def test_firewall_policies_status():
+    # Policy 99 does not exist, so its chunk is retried one by one
+    result, awaited = both(lambda api: api.policy_packages.firewall_policies_disable(policy_package="default", ids=[1, 2, 99, 4]))
+
+    assert awaited == result
+    assert {id: status['code'] for id, status in result.items()} == {1: 0, 2: 0, 99: -3, 4: 0}
+
+    result, awaited = both(lambda api: api.policy_packages.firewall_policies_enable(policy_package="default", where=lambda policy: policy['policyid'] > 8))
+
+    assert awaited == result
+    assert sorted(result) == [9, 10]
+
+
+def test_reconcile():
+    desired = {"site_id": {"FGT-00001": "1", "FGT-00002/root": "2"}}
+
+    def reconcile(api):
+        api.metadata_variables.add(name="site_id")
+        return api.metadata_variables.reconcile(desired)
+
+    async def reconcile_async(api):
+        await api.metadata_variables.add(name="site_id")
+        return await api.metadata_variables.reconcile(desired)
+
+    result, awaited = both(lambda api: reconcile_async(api) if isinstance(api, AsyncApi) else reconcile(api))
+
+    assert awaited == result
+    assert result['changes'] == {"site_id": {"add": {"FGT-00001/global": "1", "FGT-00002/root": "2"}, "update": {}, "delete": []}}
+
+
+def test_reconcile_raises_for_a_missing_variable():
+    with pytest.raises(FortiManagerError):
+        both(lambda api: api.metadata_variables.reconcile({"missing": {"FGT-00001": "1"}}))
+
+
+def test_check_status():
+    result, awaited = both(lambda api: api.fortiaps.check_status(wtp_id="FP231F00000100", fortigate="FGT-00001"))
+
+    assert result is True
+    assert awaited is True
+
+
+def test_transport_is_refused():
+    with pytest.raises(TypeError):
+        AsyncApi(host="https://fortimanager.example.com", token="token", transport=object())
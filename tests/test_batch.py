@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.batch import BatchItem
+from pyfortimanager.core.simulator import Simulator
+
+
+class Requests(object):
+    """Hook that keeps the method and number of payloads of every request sent."""
+
+    def __init__(self):
+        self.sent = []
+
+    def before(self, info):
+        self.sent.append((info.method, len(info.urls)))
+
+
+@pytest.fixture
+def api():
+    with Simulator(devices=20) as sim, Api(host=sim.url, token="token", hooks=[Requests()]) as api:
+        yield api
+
+
+def test_results_are_in_queue_order(api):
+    batch = api.batch()
+    batch.queue(method="get", params={"url": "/dvmdb/adom/root/device/FGT-00001"})
+    batch.queue(method="get", params={"url": "/dvmdb/adom/root/device/FGT-99999"})
+    item = batch.fortigates.update(fortigate="FGT-00002", description="Updated")
+    batch.queue(method="get", params={"url": "/dvmdb/adom/root/device/FGT-00002"})
+
+    assert isinstance(item, BatchItem)
+    assert len(batch) == 4
+
+    results = batch.send()
+
+    assert len(batch) == 0
+    assert results == batch.results
+    assert [result['status']['code'] for result in results] == [0, -3, 0, 0]
+    assert results[0]['data']['name'] == "FGT-00001"
+    assert item.result is results[2]
+    assert results[3]['data']['desc'] == "Updated"
+
+    # Consecutive calls with the same method are combined
+    assert api.hooks[0].sent == [("get", 2), ("update", 1), ("get", 1)]
+
+
+def test_split_by_max_items(api):
+    with api.batch(max_items=3) as batch:
+        for index in range(7):
+            batch.queue(method="get", params={"url": f"/dvmdb/adom/root/device/FGT-{index:05d}"})
+
+    assert api.hooks[0].sent == [("get", 3), ("get", 3), ("get", 1)]
+    assert [result['data']['name'] for result in batch.results] == [f"FGT-{index:05d}" for index in range(7)]
+
+
+def test_split_by_max_bytes(api):
+    params = [{"url": f"/dvmdb/adom/root/device/FGT-{index:05d}"} for index in range(5)]
+    size = len(json.dumps(params[0]))
+
+    with api.batch(max_bytes=size * 2) as batch:
+        for payload in params:
+            batch.queue(method="get", params=payload)
+
+    assert api.hooks[0].sent == [("get", 2), ("get", 2), ("get", 1)]
+    assert [result['data']['name'] for result in batch.results] == [f"FGT-{index:05d}" for index in range(5)]
+
+
+def test_nothing_is_sent_when_the_block_raises(api):
+    with pytest.raises(ValueError):
+        with api.batch() as batch:
+            batch.queue(method="get", params={"url": "/dvmdb/adom/root/device/FGT-00001"})
+            raise ValueError()
+
+    assert api.hooks[0].sent == []
+
+
+def test_async_batch_keeps_the_order():
+    pytest.importorskip("aiohttp")
+    from pyfortimanager.core.async_api import AsyncApi
+
+    async def send(url):
+        async with AsyncApi(host=url, token="token") as api:
+            async with api.batch(max_items=2) as batch:
+                for index in (3, 1, 99, 2, 0):
+                    batch.queue(method="get", params={"url": f"/dvmdb/adom/root/device/FGT-{index:05d}"})
+
+            return batch.results
+
+    with Simulator(devices=5) as sim:
+        results = asyncio.run(send(sim.url))
+
+    assert [(result.get('data') or {}).get('name') for result in results] == ["FGT-00003", "FGT-00001", None, "FGT-00002", "FGT-00000"]
@@ -0,0 +1,25 @@
+from pyfortimanager.core.cache import ResponseCache
+
+
+OK = {"status": {"code": 0, "message": "OK"}, "data": []}
+
+
+def test_reads_without_ttl_do_not_invalidate():
+    cache = ResponseCache(ttls={"/pm/config/device": 0})
+    cache.update("get", {"url": "/pm/config/adom/root/obj/firewall/address"}, OK)
+
+    cache.update("get", {"url": "/pm/config/device/FGT-1/vdom/root/system/interface"}, OK)
+    cache.update("get", {"url": "/task/task"}, OK)
+
+    assert len(cache) == 1
+
+
+def test_writes_invalidate_related_urls():
+    cache = ResponseCache()
+    cache.update("get", {"url": "/pm/config/adom/root/obj/firewall/address"}, OK)
+    cache.update("exec", {"url": "/um/image/version/list"}, OK)
+
+    cache.update("set", {"url": "/pm/config/device/FGT-1/vdom/root/system/interface"}, OK)
+
+    assert len(cache) == 1
+    assert cache.get("exec", {"url": "/um/image/version/list"}) == OK
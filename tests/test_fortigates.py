@@ -0,0 +1,53 @@
+import json
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.transport import Response
+
+
+class Transport(object):
+    """Answers each payload with answer(method, params)."""
+
+    def __init__(self, answer):
+        self.answer = answer
+
+    def send(self, api, url, body, headers, timeout, stream=False):
+        request = json.loads(body)
+        results = [self.answer(request['method'], params) for params in request['params']]
+
+        return Response(status_code=200, content=json.dumps({"id": 1, "result": results}).encode())
+
+    def close(self):
+        pass
+
+
+DEVICES = [{"serial": f"FGT60F{index:010d}", "mr": 2, "os_ver": 7} for index in range(4)]
+
+
+def test_add_many_reports_a_missing_task_per_fortigate():
+    def answer(method, params):
+        if params['url'] == "/task/task":
+            return {"status": {"code": 0}, "data": [{"id": 6, "state": 4, "percent": 100, "line": [{"name": "FGT60F0000000002", "err": 0}]}]}
+
+        task = 5 if params['data']['add-dev-list'][0]['name'] == "FGT60F0000000000" else 6
+        return {"status": {"code": 0}, "data": {"taskid": task}}
+
+    results = Api(host="https://fortimanager", token="token", transport=Transport(answer)).fortigates.add_many(DEVICES, chunk_size=2, timeout=10)
+
+    assert results["FGT60F0000000000"]['status'] == {"code": -3, "message": "Task 5 does not exist"}
+    assert results["FGT60F0000000001"]['status']['code'] == -3
+    assert results["FGT60F0000000002"]['status'] == {"code": 0, "message": "OK"}
+    assert results["FGT60F0000000003"]['status'] == {"code": -1, "message": "FortiGate not found in the task"}
+
+
+def test_add_many_reports_failed_polls_per_fortigate():
+    def answer(method, params):
+        if params['url'] == "/task/task":
+            return {"status": {"code": -11, "message": "No permission for the resource"}}
+
+        return {"status": {"code": 0}, "data": {"taskid": 5}}
+
+    api = Api(host="https://fortimanager", token="token", transport=Transport(answer))
+    api.task_waiter = lambda: Api.task_waiter(api, interval=0.01, max_interval=0.01)
+    results = api.fortigates.add_many(DEVICES, timeout=10)
+
+    assert all(result['status']['code'] == -11 for result in results.values())
@@ -0,0 +1,86 @@
+import pytest
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.simulator import Simulator
+
+MAPPING = "/pm/config/adom/{adom}/obj/fmg/variable/{variable}/dynamic_mapping"
+
+
+class Requests(object):
+    """Hook that keeps the method of every request sent."""
+
+    def __init__(self):
+        self.methods = []
+
+    def before(self, info):
+        self.methods.append(info.method)
+
+
+@pytest.fixture
+def sim():
+    with Simulator(devices=10) as sim:
+        yield sim
+
+
+@pytest.fixture
+def api(sim):
+    with Api(host=sim.url, token="token", hooks=[Requests()]) as api:
+        api.metadata_variables.add(name="site_id")
+        api.metadata_variables.add(name="region")
+        api.hooks[0].methods.clear()
+        sim.requests.clear()
+        yield api
+
+
+def test_second_run_makes_no_writes(sim, api):
+    desired = {"site_id": {"FGT-00001": "1", "FGT-00002/root": "2"}, "region": {"FGT-00001": "north"}}
+
+    first = api.metadata_variables.reconcile(desired)
+
+    assert first['changes'] == {
+        "site_id": {"add": {"FGT-00001/global": "1", "FGT-00002/root": "2"}, "update": {}, "delete": []},
+        "region": {"add": {"FGT-00001/global": "north"}, "update": {}, "delete": []}
+    }
+    assert len(first['responses']) == 2
+    assert api.hooks[0].methods == ["get", "add"]
+
+    api.hooks[0].methods.clear()
+    sim.requests.clear()
+    second = api.metadata_variables.reconcile(desired)
+
+    assert second['responses'] == []
+    assert second['changes'] == {variable: {"add": {}, "update": {}, "delete": []} for variable in desired}
+    assert api.hooks[0].methods == ["get"]
+    assert sim.requests == {("get", MAPPING): 2}
+
+
+def test_update_and_delete(sim, api):
+    api.metadata_variables.reconcile({"site_id": {"FGT-00001": "1", "FGT-00002": "2", "FGT-00003/root": "3"}})
+    api.hooks[0].methods.clear()
+    sim.requests.clear()
+
+    result = api.metadata_variables.reconcile({"site_id": {"FGT-00001": 1, "FGT-00002": "20", "FGT-00004": "4"}})
+
+    # Values are compared as strings, so 1 matches "1"
+    assert result['changes'] == {"site_id": {"add": {"FGT-00004/global": "4"}, "update": {"FGT-00002/global": "20"}, "delete": ["FGT-00003/root"]}}
+    assert api.hooks[0].methods == ["get", "delete", "update", "add"]
+    assert sim.requests[("delete", MAPPING + "/{device}/{vdom}")] == 1
+    assert api.metadata_variables.reconcile({"site_id": {"FGT-00001": "1", "FGT-00002": "20", "FGT-00004": "4"}})['responses'] == []
+
+
+def test_prune_false_keeps_other_members(api):
+    api.metadata_variables.reconcile({"site_id": {"FGT-00001": "1", "FGT-00002": "2"}})
+
+    result = api.metadata_variables.reconcile({"site_id": {"FGT-00001": "1"}}, prune=False)
+
+    assert result['changes'] == {"site_id": {"add": {}, "update": {}, "delete": []}}
+    assert result['responses'] == []
+
+
+def test_writes_are_chunked(sim, api):
+    result = api.metadata_variables.reconcile({"site_id": {f"FGT-{index:05d}": str(index) for index in range(5)}}, chunk_size=2)
+
+    assert len(result['changes']['site_id']['add']) == 5
+    assert len(result['responses']) == 3
+    assert sim.requests[("add", MAPPING)] == 3
+    assert api.hooks[0].methods == ["get", "add"]
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.fortimanager import FortiManager
+from pyfortimanager.core.simulator import Simulator
+
+PROXY = ("exec", "/sys/proxy/json")
+
+
+def test_results_are_keyed_by_fortigate():
+    fortigates = [f"FGT-{index:05d}" for index in range(5)]
+
+    with Simulator(devices=5) as sim, Api(host=sim.url, token="token") as api:
+        results = api.fortigates_proxy.status(fortigate=fortigates)
+
+    assert list(results) == fortigates
+    assert all(result['target'] == fortigate for fortigate, result in results.items())
+    assert all(result['status']['code'] == 0 for result in results.values())
+    assert results["FGT-00003"]['response']['results']['hostname'] == "FGT-00003"
+
+
+def test_a_single_fortigate_gets_the_response_as_is():
+    with Simulator(devices=2) as sim, Api(host=sim.url, token="token") as api:
+        response = api.fortigates_proxy.status(fortigate="FGT-00001")
+
+    assert response['status']['code'] == 0
+    assert response['data'][0]['target'] == "FGT-00001"
+
+
+def test_status_of_each_fortigate():
+    with Simulator(devices=100, offline_rate=0.5) as sim, Api(host=sim.url, token="token") as api:
+        offline = next(index for index in range(100) if sim.device(index)['conn_status'] != 1)
+        online = next(index for index in range(100) if sim.device(index)['conn_status'] == 1)
+        fortigates = [f"FGT-{online:05d}", f"FGT-{offline:05d}", "FGT-99999"]
+        results = api.fortigates_proxy.status(fortigate=fortigates)
+
+    assert [results[fortigate]['status']['code'] for fortigate in fortigates] == [0, -1, -3]
+
+
+def test_fortimanager_error_is_spread_to_every_fortigate():
+    fortigates = ["FGT-00000", "FGT-00001", "FGT-00002"]
+
+    with Simulator(devices=3, rpc_error_rate=1) as sim, Api(host=sim.url, token="token") as api:
+        results = api.fortigates_proxy.status(fortigate=fortigates)
+
+    assert list(results) == fortigates
+    assert all(result == {"status": {"code": -10, "message": "Internal error"}, "target": fortigate} for fortigate, result in results.items())
+
+
+def test_fortigates_missing_from_the_response():
+    response = {"status": {"code": 0, "message": "OK"}, "data": [{"status": {"code": 0}, "target": "FGT-2", "response": {}}]}
+
+    results = FortiManager._proxy_split(["FGT-1", "FGT-2", "FGT-3"], response)
+
+    assert list(results) == ["FGT-1", "FGT-2", "FGT-3"]
+    assert results["FGT-1"] == {"status": {"code": -1, "message": "No response from the FortiGate"}, "target": "FGT-1"}
+    assert results["FGT-2"] is response['data'][0]
+    assert FortiManager._proxy_split(["FGT-1"], None)["FGT-1"]['status'] == {"code": -1, "message": "No response from the FortiManager"}
+
+
+def test_calls_are_chunked_by_proxy_chunk_size():
+    fortigates = [f"FGT-{index:05d}" for index in range(5)]
+
+    with Simulator(devices=5) as sim, Api(host=sim.url, token="token", proxy_chunk_size=2) as api:
+        results = api.fortigates_proxy.status(fortigate=fortigates)
+
+        assert sim.requests[PROXY] == 3
+
+    assert list(results) == fortigates
+    assert all(result['status']['code'] == 0 for result in results.values())
+
+
+def test_async_proxy_matches_the_api():
+    pytest.importorskip("aiohttp")
+    from pyfortimanager.core.async_api import AsyncApi
+
+    fortigates = [f"FGT-{index:05d}" for index in range(5)] + ["FGT-99999"]
+
+    async def status(url):
+        async with AsyncApi(host=url, token="token", proxy_chunk_size=2) as api:
+            return await api.fortigates_proxy.status(fortigate=fortigates)
+
+    with Simulator(devices=5) as sim, Api(host=sim.url, token="token", proxy_chunk_size=2) as api:
+        assert asyncio.run(status(sim.url)) == api.fortigates_proxy.status(fortigate=fortigates)
+        assert sim.requests[PROXY] == 6
@@ -0,0 +1,22 @@
+import copy
+import pickle
+
+from pyfortimanager.core.records import Device
+
+
+def test_missing_fields_are_left_out():
+    device = Device({"name": "FGT-1", "sn": "FGT60F0000000001", "ip": None, "tab_status": "x"})
+
+    assert device.to_dict() == {"name": "FGT-1", "sn": "FGT60F0000000001", "ip": None, "tab_status": "x"}
+    assert "ip" in device
+    assert "os_ver" not in device
+    assert device.get("os_ver", "default") == "default"
+    assert device.get("ip", "default") is None
+    assert device.os_ver is None
+
+
+def test_copy_and_pickle_keep_missing_fields_missing():
+    device = Device({"name": "FGT-1"})
+
+    assert copy.copy(device).to_dict() == {"name": "FGT-1"}
+    assert pickle.loads(pickle.dumps(device)) == device
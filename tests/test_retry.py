@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+import pytest
+
+from pyfortimanager.core.api import Api
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.retry import CircuitBreaker
+from pyfortimanager.core.simulator import Simulator
+
+
+def test_released_trial_lets_the_next_request_try():
+    breaker = CircuitBreaker(failures=1, reset_timeout=0.01)
+    breaker.failure()
+    time.sleep(0.02)
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+
+
+def test_open_breaker_fails_streams_fast():
+    breaker = CircuitBreaker(failures=1, reset_timeout=60)
+    breaker.failure()
+
+    with Simulator(devices=5) as sim:
+        with pytest.raises(FortiManagerError, match="Circuit breaker is open"):
+            list(Api(host=sim.url, token="token", circuit_breaker=breaker).fortigates.all(stream=True))
+
+        assert not sim.requests
+
+
+def test_failed_stream_opens_the_breaker():
+    with Simulator(devices=5) as sim:
+        url = sim.url
+
+    # The simulator has stopped, so nothing listens on the port
+    breaker = CircuitBreaker(failures=1, reset_timeout=60)
+
+    with pytest.raises(FortiManagerError, match="Connection error"):
+        list(Api(host=url, token="token", circuit_breaker=breaker).fortigates.all(stream=True))
+
+    assert breaker.state == "open"
+
+
+def test_open_breaker_fails_async_streams_fast():
+    pytest.importorskip("aiohttp")
+    from pyfortimanager.core.async_api import AsyncApi
+
+    breaker = CircuitBreaker(failures=1, reset_timeout=60)
+    breaker.failure()
+
+    async def stream(url):
+        async with AsyncApi(host=url, token="token", circuit_breaker=breaker) as api:
+            return [item async for item in api.fortigates.all(stream=True)]
+
+    with Simulator(devices=5) as sim:
+        with pytest.raises(FortiManagerError, match="Circuit breaker is open"):
+            asyncio.run(stream(sim.url))
+
+        assert not sim.requests
@@ -0,0 +1,131 @@
+import json
+import random
+
+import pytest
+
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.streaming import DataDecoder
+
+
+def body(data, code: int = 0, url: str = "/dvmdb/adom/root/device"):
+    result = {"status": {"code": code, "message": "OK" if code == 0 else "Object does not exist"}, "url": url}
+
+    if data is not None:
+        result['data'] = data
+
+    return json.dumps({"id": 1, "result": [result]}).encode()
+
+
+def decode(raw: bytes, chunk_size: int):
+    decoder = DataDecoder(url="/test")
+    items = []
+
+    for start in range(0, len(raw), chunk_size):
+        items.extend(decoder.feed(raw[start:start + chunk_size]))
+
+    items.extend(decoder.close())
+
+    return items
+
+
+ITEMS = [
+    {"name": "FGT-1", "desc": "quote \" and backslash \\ and \\\" inside", "meta fields": {"a": "]}{[,"}},
+    {"name": "FGT-2", "unicode": "æøå ☃ \U0001F600", "escaped": "æ\n\t\\u0041", "empty": {}, "list": []},
+    -12.5e-3,
+    1234567890,
+    "a string, with ] and }",
+    True,
+    False,
+    None,
+    [1, [2, [3, {"x": [4]}]]],
+    {"nested": {"deep": [{"deeper": "\"\\"}]}},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+def test_items_at_every_chunk_boundary(chunk_size):
+    assert decode(body(ITEMS), chunk_size) == ITEMS
+
+
+def test_random_chunking_matches_json_loads():
+    generator = random.Random(9)
+
+    for _ in range(50):
+        data = [
+            {"name": f"FGT-{index}", "value": generator.choice([1, -0.5, 3e10, "x\\\"y", None, True, [], {"k": "]"}])}
+            for index in range(generator.randint(0, 20))
+        ]
+        raw = body(data)
+        decoder = DataDecoder()
+        items, position = [], 0
+
+        while position < len(raw):
+            size = generator.randint(1, 40)
+            items.extend(decoder.feed(raw[position:position + size]))
+            position += size
+
+        items.extend(decoder.close())
+
+        assert items == json.loads(raw)['result'][0]['data']
+
+
+@pytest.mark.parametrize("number", ["0", "-1", "12345678901234567890", "1.5e+10", "-0.25E-3"])
+def test_numbers_split_across_chunks(number):
+    raw = b'{"result": [{"data": [' + number.encode() + b", " + number.encode() + b'], "status": {"code": 0}}]}'
+
+    assert decode(raw, 1) == [json.loads(number)] * 2
+
+
+def test_multibyte_characters_split_across_chunks():
+    data = [{"name": "æøå\U0001F600"}]
+    raw = json.dumps({"result": [{"data": data, "status": {"code": 0}}]}, ensure_ascii=False).encode()
+
+    assert decode(raw, 1) == data
+
+
+def test_single_object_is_returned_on_close():
+    data = {"name": "FGT-1", "sn": "FGT60F0000000001"}
+
+    assert decode(body(data), 5) == [data]
+
+
+def test_empty_array_and_missing_data():
+    assert decode(body([]), 3) == []
+    assert decode(body(None), 3) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100000])
+def test_error_status_raises_on_close(chunk_size):
+    with pytest.raises(FortiManagerError) as error:
+        decode(body([], code=-3), chunk_size)
+
+    assert error.value.code == -3
+
+
+def test_error_status_without_data_raises():
+    with pytest.raises(FortiManagerError) as error:
+        decode(body(None, code=-11), 4)
+
+    assert error.value.code == -11
+
+
+def test_status_before_data_is_checked():
+    raw = b'{"result": [{"status": {"code": -6, "message": "Invalid url"}, "data": [1, 2]}]}'
+
+    with pytest.raises(FortiManagerError) as error:
+        decode(raw, 2)
+
+    assert error.value.code == -6
+
+
+def test_data_of_later_results_is_ignored():
+    raw = b'{"result": [{"status": {"code": 0}, "url": "/a"}, {"data": [1, 2], "status": {"code": 0}}]}'
+
+    assert decode(raw, 3) == []
+
+
+def test_incomplete_body_raises():
+    raw = body([{"name": "FGT-1"}, {"name": "FGT-2"}])
+
+    with pytest.raises(FortiManagerError):
+        decode(raw[:-20], 8)
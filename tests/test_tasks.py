@@ -0,0 +1,62 @@
+import pytest
+
+from pyfortimanager.core.exceptions import FortiManagerError
+from pyfortimanager.core.tasks import TaskWaiter
+
+
+class Api(object):
+    """Stands in for the API, answering every poll with the next response."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def _model(self, model):
+        return self
+
+    def post(self, method, params):
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+
+def test_unknown_task_fails():
+    api = Api({"status": {"code": 0}, "data": [{"id": 1, "state": 4, "percent": 100}]})
+
+    with TaskWaiter(api=api, interval=0.01) as waiter:
+        done, unknown = waiter.watch(1), waiter.watch(2)
+
+        assert done.result(timeout=5)['state'] == 4
+
+        with pytest.raises(FortiManagerError) as error:
+            unknown.result(timeout=5)
+
+    assert error.value.code == -3
+
+
+def test_repeated_poll_errors_fail_the_pending_tasks():
+    api = Api({"status": {"code": -6, "message": "Invalid url"}})
+
+    with TaskWaiter(api=api, interval=0.01, max_interval=0.01, max_errors=2) as waiter:
+        with pytest.raises(FortiManagerError) as error:
+            waiter.wait([1], timeout=5)
+
+    assert error.value.code == -6
+    assert waiter.polls == 2
+
+
+def test_poll_error_is_retried():
+    api = Api(ConnectionError("down"), {"status": {"code": 0}, "data": [{"id": 1, "state": 4, "percent": 100}]})
+
+    with TaskWaiter(api=api, interval=0.01, max_interval=0.01) as waiter:
+        assert waiter.wait([1], timeout=5)[1]['state'] == 4
+
+
+def test_task_id_as_string():
+    api = Api({"status": {"code": 0}, "data": [{"id": 123, "state": 4, "percent": 100}]})
+
+    with TaskWaiter(api=api, interval=0.01) as waiter:
+        assert waiter.watch("123").result(timeout=5)['id'] == 123
+        assert waiter.wait(["123"], timeout=5) == {123: {"id": 123, "state": 4, "percent": 100}}